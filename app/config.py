@@ -60,10 +60,18 @@ class Settings:
     )
     MAX_TRANSLATION_LENGTH: int = int(os.getenv("MAX_TRANSLATION_LENGTH", "512"))
     TRANSLATION_DEVICE: str = "cpu"  # CPU推奨（Raspberry Pi対応）
+    # CPU推論時にLinear層をint8へ動的量子化（速度・メモリ効率向上、翻訳結果が変わるためオプトイン）
+    QUANTIZE_TRANSLATION: bool = (
+        os.getenv("QUANTIZE_TRANSLATION", "false").lower() == "true"
+    )
 
     # セッション管理設定
     SESSION_TIMEOUT_MINUTES: int = int(os.getenv("SESSION_TIMEOUT_MINUTES", "30"))
     MAX_CHUNKS_PER_SESSION: int = int(os.getenv("MAX_CHUNKS_PER_SESSION", "100"))
+    # 期限切れセッションを掃除する間隔（秒）
+    SESSION_CLEANUP_INTERVAL_SECONDS: float = float(
+        os.getenv("SESSION_CLEANUP_INTERVAL_SECONDS", "30")
+    )
 
     # 累積バッファ設定
     # Phase 8修正: 30秒 → 12秒（精度優先、表記揺れを最小化）
@@ -86,13 +94,24 @@ class Settings:
     # ブラウザ版で使用（ラズパイは不使用）
     # Ollama設定（API）
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://local-llm:11434")
-    OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "gemma3:4b")
+    OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "gemma3:4b-it-q4_K_M")
     OLLAMA_TIMEOUT: int = int(os.getenv("OLLAMA_TIMEOUT", "120"))
     OLLAMA_TEMPERATURE: float = 0.2
     OLLAMA_NUM_PREDICT: int = 256
     OLLAMA_TOP_K: int = 10
     OLLAMA_TOP_P: float = 0.9
     OLLAMA_REPEAT_PENALTY: float = 1.1
+    # コンテキスト長（0の場合はプロンプト長と最大チャンク長から自動で見積もる）
+    OLLAMA_NUM_CTX: int = int(os.getenv("OLLAMA_NUM_CTX", "0"))
+    # リクエスト後にモデル（とプロンプトキャッシュ）をメモリに保持する時間
+    OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    # 分割したチャンクをLLMに並列送信する際の最大同時実行数
+    OLLAMA_CONCURRENCY: int = int(os.getenv("OLLAMA_CONCURRENCY", "2"))
+    # 一時的なエラー時の再試行回数と、再試行の待ち時間（バックオフ）の合計の上限（秒）
+    OLLAMA_MAX_RETRIES: int = int(os.getenv("OLLAMA_MAX_RETRIES", "2"))
+    OLLAMA_RETRY_BUDGET: float = float(os.getenv("OLLAMA_RETRY_BUDGET", "10.0"))
+    # LLM変換結果キャッシュの有効期間（秒）
+    OLLAMA_CACHE_TTL: int = int(os.getenv("OLLAMA_CACHE_TTL", "86400"))
 
     # 要約設定（Phase 13追加）
     SUMMARY_PROVIDER: str = os.getenv(
@@ -100,7 +119,7 @@ class Settings:
     )  # "ollama" or "gemini"
 
     # Ollama要約用（デフォルトプロバイダー）
-    OLLAMA_SUMMARY_MODEL: str = os.getenv("OLLAMA_SUMMARY_MODEL", "gemma3:4b")
+    OLLAMA_SUMMARY_MODEL: str = os.getenv("OLLAMA_SUMMARY_MODEL", "gemma3:4b-it-q4_K_M")
     OLLAMA_SUMMARY_NUM_PREDICT: int = int(
         os.getenv("OLLAMA_SUMMARY_NUM_PREDICT", "1024")
     )
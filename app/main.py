@@ -21,13 +21,31 @@ from utils.performance_monitor import PerformanceMonitor
 from utils.logger import logger
 from config import settings
 import asyncio
+from contextlib import asynccontextmanager
 import time
 import json
 import os
 from typing import Optional, Dict
 from pydantic import BaseModel
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """起動時に期限切れセッションの定期掃除を開始し、終了時に停止する"""
+    cleanup_task = asyncio.create_task(
+        session_manager.cleanup_loop(settings.SESSION_CLEANUP_INTERVAL_SECONDS)
+    )
+    try:
+        yield
+    finally:
+        cleanup_task.cancel()
+        try:
+            await cleanup_task
+        except asyncio.CancelledError:
+            pass
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -762,9 +780,9 @@ async def perform_cumulative_transcription(
             session_id, "transcribing", "累積音声を文字起こし中...", chunk_id
         )
 
-        # 累積音声を取得
-        accumulated_audio = buffer.get_accumulated_audio()
-        if not accumulated_audio:
+        # 累積音声を取得（16kHz/モノラルのfloat32サンプル、WAV化・ffmpeg変換は不要）
+        accumulated_audio = buffer.get_accumulated_samples()
+        if not accumulated_audio.size:
             logger.warning(f"⚠️ 累積音声が空です: {session_id}")
             return
 
@@ -774,7 +792,7 @@ async def perform_cumulative_transcription(
         # 文字起こし実行
         with monitor.measure("transcription"):
             text, segments = await transcribe_async(
-                accumulated_audio, suffix=".wav", initial_prompt=initial_prompt
+                accumulated_audio, initial_prompt=initial_prompt
             )
 
         transcription_time = monitor.get_last_measurement("transcription")
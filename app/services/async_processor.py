@@ -8,8 +8,9 @@ import tempfile
 import subprocess
 import os
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from typing import Optional, Union
 
+import numpy as np
 from faster_whisper import WhisperModel
 from config import settings
 from utils.logger import logger
@@ -49,13 +50,15 @@ def get_whisper_model() -> WhisperModel:
 
 
 def _transcribe_sync(
-    audio_data: bytes, suffix: str = ".wav", initial_prompt: Optional[str] = None
+    audio_data: Union[bytes, np.ndarray],
+    suffix: str = ".wav",
+    initial_prompt: Optional[str] = None,
 ) -> tuple:
     """
     同期的な音声文字起こし処理
 
     Args:
-        audio_data: 音声データのバイト列
+        audio_data: 音声データのバイト列、または16kHz/モノラルのfloat32サンプル配列
         suffix: ファイル拡張子
         initial_prompt: 文脈として使用する前回の文字起こし結果
 
@@ -70,31 +73,36 @@ def _transcribe_sync(
     converted_path = None
 
     try:
-        # 一時ファイル作成
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(audio_data)
-            tmp_path = tmp.name
-
-        # ffmpegで16kHz/モノラルに変換
-        # Phase 4最適化: loudnormフィルタを削除（処理時間0.2秒削減）
-        # Whisper VADが無音区間を自動処理するため、音量正規化は不要
-        converted_path = tmp_path.rsplit(".", 1)[0] + "_16k.wav"
-        subprocess.run(
-            [
-                "ffmpeg",
-                "-y",
-                "-i",
-                tmp_path,
-                "-ar",
-                "16000",
-                "-ac",
-                "1",
-                converted_path,
-            ],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
+        if isinstance(audio_data, np.ndarray):
+            # サンプル配列はそのままWhisperに渡す（一時ファイル・ffmpegを省略）
+            whisper_input = audio_data
+        else:
+            # 一時ファイル作成
+            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+                tmp.write(audio_data)
+                tmp_path = tmp.name
+
+            # ffmpegで16kHz/モノラルに変換
+            # Phase 4最適化: loudnormフィルタを削除（処理時間0.2秒削減）
+            # Whisper VADが無音区間を自動処理するため、音量正規化は不要
+            converted_path = tmp_path.rsplit(".", 1)[0] + "_16k.wav"
+            subprocess.run(
+                [
+                    "ffmpeg",
+                    "-y",
+                    "-i",
+                    tmp_path,
+                    "-ar",
+                    "16000",
+                    "-ac",
+                    "1",
+                    converted_path,
+                ],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            whisper_input = converted_path
 
         # VADオプション
         vad_options = VadOptions(
@@ -130,7 +138,7 @@ def _transcribe_sync(
             transcribe_params["initial_prompt"] = initial_prompt
             logger.debug(f"📝 initial_prompt設定: {initial_prompt[:50]}...")
 
-        segments, info = model.transcribe(converted_path, **transcribe_params)
+        segments, info = model.transcribe(whisper_input, **transcribe_params)
 
         # セグメントからテキストを抽出（Phase 12: セグメント単位の品質フィルタリング）
         texts = []
@@ -170,13 +178,15 @@ def _transcribe_sync(
 
 
 async def transcribe_async(
-    audio_data: bytes, suffix: str = ".wav", initial_prompt: Optional[str] = None
+    audio_data: Union[bytes, np.ndarray],
+    suffix: str = ".wav",
+    initial_prompt: Optional[str] = None,
 ) -> tuple:
     """
     非同期的な音声文字起こし処理
 
     Args:
-        audio_data: 音声データのバイト列
+        audio_data: 音声データのバイト列、または16kHz/モノラルのfloat32サンプル配列
         suffix: ファイル拡張子
         initial_prompt: 文脈として使用する前回の文字起こし結果
 
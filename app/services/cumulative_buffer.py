@@ -6,13 +6,28 @@
 
 import re
 import io
+import logging
 import wave
+import struct
+import time
+from collections import deque
+from difflib import SequenceMatcher
 from dataclasses import dataclass, field
-from typing import Optional, Tuple, List
+from functools import lru_cache
+from typing import Deque, Optional, Tuple, List
 from datetime import datetime
+
+import numpy as np
+
 from utils.logger import logger
 from services.text_filter import is_valid_text
 
+# 類似度計算はC++実装の rapidfuzz を優先（未インストール時は difflib で代替）
+try:
+    from rapidfuzz.fuzz import ratio as _fuzz_ratio
+except ImportError:
+    _fuzz_ratio = None
+
 
 @dataclass
 class CumulativeBufferConfig:
@@ -26,11 +41,20 @@ class CumulativeBufferConfig:
     sample_rate: int = 16000  # サンプルレート
     channels: int = 1  # チャンネル数
     sample_width: int = 2  # サンプル幅（16bit = 2bytes）
+    bytes_per_second: int = field(init=False)  # 1秒あたりのバイト数
+    max_audio_bytes: int = field(init=False)  # 最大音声バイト数
+
+    def __post_init__(self):
+        # トリミング判定のたびに再計算しないよう、生成時に一度だけ計算する
+        self.bytes_per_second = self.sample_rate * self.channels * self.sample_width
+        self.max_audio_bytes = int(
+            self.max_audio_duration_seconds * self.bytes_per_second
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptionResult:
-    """文字起こし結果"""
+    """文字起こし結果（更新のたびに生成されるため __slots__ で軽量化）"""
 
     confirmed_text: str  # 確定テキスト（変更されない部分）
     tentative_text: str  # 暫定テキスト（まだ変わる可能性あり）
@@ -44,6 +68,47 @@ class TranscriptionResult:
     )  # Phase 12.2: 新規確定セグメントのリスト
 
 
+# WAVヘッダー（RIFF + fmt + data チャンクヘッダー）
+_WAV_HEADER_FORMAT = "<4sI4s4sIHHIIHH4sI"
+_WAV_HEADER_SIZE = struct.calcsize(_WAV_HEADER_FORMAT)
+
+# 文末記号（先頭以外で最初に現れる位置で確定テキストを区切る）
+_SENTENCE_END_CHARS = "。！？"
+_SENTENCE_END_PATTERN = re.compile(f"[{_SENTENCE_END_CHARS}]")
+
+# 確定テキストの区切りとみなす文字
+_BREAK_CHARS = ("。", "！", "？", " ", "　")
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """2つの文字列の共通接頭辞の長さを返す
+
+    文字単位のPythonループではなく、str.startswith による二分探索で
+    比較をC実装側に任せる（os.path.commonprefix は内部がPythonループのため使わない）。
+    """
+    hi = min(len(a), len(b))
+    # よくあるケース: 一方がもう一方の接頭辞（Whisperの出力が前回を含んで伸びる）
+    if a.startswith(b[:hi]):
+        return hi
+
+    lo = 0
+    hi -= 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a.startswith(b[lo:mid], lo):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _similarity(a: str, b: str) -> float:
+    """2つの文字列の類似度（0.0〜1.0）を返す"""
+    if _fuzz_ratio is not None:
+        return _fuzz_ratio(a, b) / 100
+    return SequenceMatcher(None, a, b).ratio()
+
+
 def extract_diff(previous: str, current: str) -> Tuple[str, str]:
     """
     前回の結果と今回の結果を比較し、確定部分と暫定部分を抽出
@@ -66,21 +131,17 @@ def extract_diff(previous: str, current: str) -> Tuple[str, str]:
 
     if not previous:
         # 前回結果がない場合、全て暫定
-        logger.debug(f"🔍 extract_diff: 前回なし → 全て暫定")
+        logger.debug("🔍 extract_diff: 前回なし → 全て暫定")
         return "", current
 
     # 前回と今回の共通接頭辞を探す
-    min_len = min(len(previous), len(current))
-    match_len = 0
-
-    for i in range(min_len):
-        if previous[i] == current[i]:
-            match_len = i + 1
-        else:
-            break
+    match_len = _common_prefix_length(previous, current)
 
     logger.debug(
-        f"🔍 extract_diff: 一致長={match_len}, 前回長={len(previous)}, 今回長={len(current)}"
+        "🔍 extract_diff: 一致長=%d, 前回長=%d, 今回長=%d",
+        match_len,
+        len(previous),
+        len(current),
     )
 
     # 完全一致の場合は前回のテキスト全体を確定
@@ -93,17 +154,9 @@ def extract_diff(previous: str, current: str) -> Tuple[str, str]:
         confirmed = current[:match_len]
 
         # 句読点で終わっていない場合、最後の句読点または空白まで戻る
-        if match_len < len(current) and not confirmed.endswith(
-            ("。", "！", "？", " ", "　")
-        ):
+        if match_len < len(current) and not confirmed.endswith(_BREAK_CHARS):
             # 最後の句読点または空白を探す
-            last_break = max(
-                confirmed.rfind("。"),
-                confirmed.rfind("！"),
-                confirmed.rfind("？"),
-                confirmed.rfind(" "),
-                confirmed.rfind("　"),
-            )
+            last_break = max(confirmed.rfind(char) for char in _BREAK_CHARS)
             if last_break > 0:
                 confirmed = confirmed[: last_break + 1]
             else:
@@ -130,7 +183,11 @@ class CumulativeBuffer:
         self.config = config or CumulativeBufferConfig()
 
         # 音声バッファ（生PCMデータ）
-        self.audio_chunks: List[bytes] = []
+        # 事前確保した bytearray に連続して書き込み、トリミングは読み出し位置を進めるだけで行う
+        self._pcm: bytearray = bytearray(self.config.max_audio_bytes * 2)
+        self._pcm_start: int = 0  # 有効データの先頭位置
+        self._pcm_end: int = 0  # 有効データの末尾位置（次回の書き込み位置）
+        self._chunk_sizes: Deque[int] = deque()  # チャンク単位でトリミングするためのサイズ記録
         self.total_audio_bytes: int = 0
 
         # チャンクカウント
@@ -138,8 +195,8 @@ class CumulativeBuffer:
 
         # 文字起こし結果
         self.last_transcription: str = ""  # 前回の文字起こし結果
-        self.confirmed_text: str = ""  # 確定済みテキスト
-        self.confirmed_hiragana: str = ""  # 確定済みひらがな
+        self._confirmed_text: str = ""  # 確定済みテキスト
+        self._confirmed_hiragana: str = ""  # 確定済みひらがな
 
         # 安定性チェック用
         self.stable_count: int = 0  # 同じ結果が続いた回数
@@ -158,8 +215,35 @@ class CumulativeBuffer:
         # Phase 12.4: force_finalize_pending_text() の確定セグメントを update_transcription に渡すための一時バッファ
         self._pending_force_segments: list = []
 
-        # 作成時刻
+        # 直前の update_transcription の結果（同一テキストが続いた場合に再利用）
+        self._last_result: Optional[TranscriptionResult] = None
+
+        # WAVヘッダーのテンプレート（サイズ欄以外は設定から決まるため一度だけ生成）
+        block_align = self.config.channels * self.config.sample_width
+        self._wav_header_template: bytes = struct.pack(
+            _WAV_HEADER_FORMAT,
+            b"RIFF",
+            0,  # RIFFチャンクサイズ（出力時に設定）
+            b"WAVE",
+            b"fmt ",
+            16,  # fmtチャンクサイズ
+            1,  # PCM
+            self.config.channels,
+            self.config.sample_rate,
+            self.config.bytes_per_second,
+            block_align,
+            self.config.sample_width * 8,
+            b"data",
+            0,  # dataチャンクサイズ（出力時に設定）
+        )
+
+        # ひらがな変換キャッシュ（暫定テキストは文字起こし間で重複が多いため）
+        self._hiragana_converter_source: Optional[callable] = None
+        self._cached_hiragana_converter: Optional[callable] = None
+
+        # 作成時刻（経過時間の計算には単調時計を使う）
         self.created_at: datetime = datetime.now()
+        self._created_monotonic: float = time.monotonic()
 
         logger.info(
             f"📦 CumulativeBuffer初期化: "
@@ -167,27 +251,40 @@ class CumulativeBuffer:
             f"{self.config.transcription_interval_chunks}チャンクごとに再処理"
         )
 
+    @property
+    def confirmed_text(self) -> str:
+        """確定済みテキスト"""
+        return self._confirmed_text
+
+    @confirmed_text.setter
+    def confirmed_text(self, value: str):
+        self._confirmed_text = value
+        self._last_result = None  # 外部からの書き換えで再利用中の結果が古くならないように
+
+    @property
+    def confirmed_hiragana(self) -> str:
+        """確定済みひらがな"""
+        return self._confirmed_hiragana
+
+    @confirmed_hiragana.setter
+    def confirmed_hiragana(self, value: str):
+        self._confirmed_hiragana = value
+        self._last_result = None  # 外部からの書き換えで再利用中の結果が古くならないように
+
     @property
     def max_audio_bytes(self) -> int:
         """最大音声バイト数"""
-        return int(
-            self.config.max_audio_duration_seconds
-            * self.config.sample_rate
-            * self.config.channels
-            * self.config.sample_width
-        )
+        return self.config.max_audio_bytes
 
     @property
     def current_audio_duration(self) -> float:
         """現在の音声長（秒）"""
-        return self.total_audio_bytes / (
-            self.config.sample_rate * self.config.channels * self.config.sample_width
-        )
+        return self.total_audio_bytes / self.config.bytes_per_second
 
     @property
     def session_elapsed_seconds(self) -> float:
         """セッション開始からの実際の経過時間（秒）"""
-        return (datetime.now() - self.created_at).total_seconds()
+        return time.monotonic() - self._created_monotonic
 
     def add_audio_chunk(self, audio_data: bytes) -> tuple[bool, bool]:
         """音声チャンクを追加
@@ -201,18 +298,19 @@ class CumulativeBuffer:
         # WAVヘッダーがある場合は除去してPCMデータを取得
         pcm_data = self._extract_pcm_from_wav(audio_data)
 
-        self.audio_chunks.append(pcm_data)
-        self.total_audio_bytes += len(pcm_data)
+        self._append_pcm(pcm_data)
         self.chunk_count += 1
 
-        logger.debug(
-            f"📥 チャンク追加: {self.chunk_count}個目, "
-            f"累積{self.current_audio_duration:.1f}秒"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "📥 チャンク追加: %d個目, 累積%.1f秒",
+                self.chunk_count,
+                self.current_audio_duration,
+            )
 
         # トリミングが必要かチェック（実行はしない）
         should_trim = (
-            self.total_audio_bytes > self.max_audio_bytes and len(self.audio_chunks) > 1
+            self.total_audio_bytes > self.max_audio_bytes and len(self._chunk_sizes) > 1
         )
 
         # 再文字起こしが必要かどうか判定
@@ -222,16 +320,57 @@ class CumulativeBuffer:
 
         return should_transcribe, should_trim
 
+    def _append_pcm(self, pcm_data: bytes):
+        """PCMデータを音声バッファの末尾に書き込む"""
+        size = len(pcm_data)
+        if self._pcm_end + size > len(self._pcm):
+            # 末尾に空きがない場合は有効データを先頭に詰める（足りなければ拡張）
+            if self.total_audio_bytes + size > len(self._pcm):
+                # 新しい領域へ有効データを直接コピー（中間コピーを作らない）
+                new_pcm = bytearray(max(len(self._pcm) * 2, self.total_audio_bytes + size))
+                with memoryview(self._pcm) as pcm_view:
+                    new_pcm[: self.total_audio_bytes] = pcm_view[
+                        self._pcm_start : self._pcm_end
+                    ]
+                self._pcm = new_pcm
+            else:
+                self._pcm[: self.total_audio_bytes] = self._pcm[
+                    self._pcm_start : self._pcm_end
+                ]
+            self._pcm_start = 0
+            self._pcm_end = self.total_audio_bytes
+
+        self._pcm[self._pcm_end : self._pcm_end + size] = pcm_data
+        self._pcm_end += size
+        self._chunk_sizes.append(size)
+        self.total_audio_bytes += size
+
     def _extract_pcm_from_wav(self, audio_data: bytes) -> bytes:
         """WAVデータからPCMデータを抽出"""
         # WAVヘッダーの確認（"RIFF"で始まる）
         if audio_data[:4] == b"RIFF":
+            # 高速パス: RIFFチャンクを直接走査して data チャンクを切り出す
+            if audio_data[8:12] == b"WAVE":
+                # クライアントが送る標準の44バイトヘッダーは走査せずに直接読む
+                if audio_data[36:40] == b"data":
+                    (data_size,) = struct.unpack_from("<I", audio_data, 40)
+                    return audio_data[_WAV_HEADER_SIZE : _WAV_HEADER_SIZE + data_size]
+
+                offset = 12
+                while offset + 8 <= len(audio_data):
+                    chunk_id, chunk_size = struct.unpack_from("<4sI", audio_data, offset)
+                    if chunk_id == b"data":
+                        return audio_data[offset + 8 : offset + 8 + chunk_size]
+                    # チャンクは2バイト境界に揃えられる
+                    offset += 8 + chunk_size + (chunk_size & 1)
+
+            # 高速パスで解析できない場合は wave モジュールで処理
             try:
                 with io.BytesIO(audio_data) as wav_buffer:
                     with wave.open(wav_buffer, "rb") as wav_file:
                         return wav_file.readframes(wav_file.getnframes())
             except Exception as e:
-                logger.warning(f"WAV解析失敗、生データとして処理: {e}")
+                logger.warning("WAV解析失敗、生データとして処理: %s", e)
                 return audio_data
         return audio_data
 
@@ -243,22 +382,32 @@ class CumulativeBuffer:
 
     def _trim_buffer_if_needed(self):
         """バッファが最大サイズを超えた場合、古いデータを削除（update_transcription内で呼ばれる）"""
-        # トリミング実行
-        while (
-            self.total_audio_bytes > self.max_audio_bytes and len(self.audio_chunks) > 1
-        ):
-            removed = self.audio_chunks.pop(0)
-            removed_seconds = len(removed) / (
-                self.config.sample_rate
-                * self.config.channels
-                * self.config.sample_width
-            )
-            self.trimmed_audio_seconds += removed_seconds
-            self.total_audio_bytes -= len(removed)
+        # トリミング実行（削除量を先に求め、読み出し位置と統計を一度だけ更新する）
+        excess = self.total_audio_bytes - self.max_audio_bytes
+        if excess <= 0:
+            return
+
+        chunk_sizes = self._chunk_sizes
+        removed = 0
+        removed_chunks = 0
+        while removed < excess and len(chunk_sizes) > 1:
+            removed += chunk_sizes.popleft()
+            removed_chunks += 1
+
+        if not removed:
+            return
+
+        removed_seconds = removed / self.config.bytes_per_second
+        self.trimmed_audio_seconds += removed_seconds
+        self.total_audio_bytes -= removed
+        self._pcm_start += removed
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"🗑️ 古いチャンク削除: {removed_seconds:.1f}秒分, "
-                f"トリミング累計={self.trimmed_audio_seconds:.1f}秒, "
-                f"残り{self.current_audio_duration:.1f}秒"
+                "🗑️ 古いチャンク削除: %d個, %.1f秒分, トリミング累計=%.1f秒, 残り%.1f秒",
+                removed_chunks,
+                removed_seconds,
+                self.trimmed_audio_seconds,
+                self.current_audio_duration,
             )
 
     def _merge_short_segments(self, segments: list) -> list:
@@ -314,7 +463,7 @@ class CumulativeBuffer:
 
         if pos < 0:
             logger.debug(
-                f"   セグメント検索失敗: '{newly_confirmed[:20]}...' が見つかりません"
+                "   セグメント検索失敗: '%s...' が見つかりません", newly_confirmed[:20]
             )
             return []
 
@@ -336,8 +485,10 @@ class CumulativeBuffer:
                 # 前回確定済みの音声区間と重複するセグメントはスキップ
                 if abs_end <= self.last_confirmed_segment_end:
                     logger.debug(
-                        f"   セグメントスキップ（確定済み範囲）: "
-                        f"{abs_start:.1f}-{abs_end:.1f}s <= {self.last_confirmed_segment_end:.1f}s"
+                        "   セグメントスキップ（確定済み範囲）: %.1f-%.1fs <= %.1fs",
+                        abs_start,
+                        abs_end,
+                        self.last_confirmed_segment_end,
                     )
                     current_pos = seg_end
                     continue
@@ -355,14 +506,14 @@ class CumulativeBuffer:
         # 短いセグメントを結合
         merged = self._merge_short_segments(result_segments)
         logger.debug(
-            f"   セグメント抽出: {len(result_segments)}個 → 結合後{len(merged)}個"
+            "   セグメント抽出: %d個 → 結合後%d個", len(result_segments), len(merged)
         )
 
         # 最後に確定したセグメントの終了時刻を更新
         if merged:
             self.last_confirmed_segment_end = merged[-1]["end"]
             logger.debug(
-                f"   確定済み終了時刻を更新: {self.last_confirmed_segment_end:.1f}s"
+                "   確定済み終了時刻を更新: %.1fs", self.last_confirmed_segment_end
             )
 
         return merged
@@ -390,21 +541,52 @@ class CumulativeBuffer:
 
     def get_accumulated_audio(self) -> bytes:
         """累積音声データをWAV形式で取得"""
-        if not self.audio_chunks:
+        if not self.total_audio_bytes:
             return b""
 
-        # 全PCMデータを結合
-        all_pcm = b"".join(self.audio_chunks)
+        data_size = self.total_audio_bytes
+        header = bytearray(self._wav_header_template)
+        # WAVヘッダーのサイズ欄のみ更新
+        struct.pack_into("<I", header, 4, _WAV_HEADER_SIZE + data_size - 8)
+        struct.pack_into("<I", header, _WAV_HEADER_SIZE - 4, data_size)
+
+        # PCMデータは連続領域のため、ヘッダーと1回の結合でコピーする
+        with memoryview(self._pcm) as pcm_view:
+            return b"".join((header, pcm_view[self._pcm_start : self._pcm_end]))
 
-        # WAV形式に変換
-        wav_buffer = io.BytesIO()
-        with wave.open(wav_buffer, "wb") as wav_file:
-            wav_file.setnchannels(self.config.channels)
-            wav_file.setsampwidth(self.config.sample_width)
-            wav_file.setframerate(self.config.sample_rate)
-            wav_file.writeframes(all_pcm)
+    def get_accumulated_samples(self) -> np.ndarray:
+        """累積音声をWhisperに直接渡せるfloat32サンプル配列（-1.0〜1.0）で取得
+
+        リングバッファ上のPCMをint16ビューとして読み、float32へ一度だけ変換する。
+        WAVへの書き出しとffmpegでの再デコードを省略できる。
+        """
+        sample_count = self.total_audio_bytes // self.config.sample_width
+        if not sample_count:
+            return np.zeros(0, dtype=np.float32)
 
-        return wav_buffer.getvalue()
+        samples = np.frombuffer(
+            self._pcm, dtype=np.int16, count=sample_count, offset=self._pcm_start
+        ).astype(np.float32)
+        samples *= 1.0 / 32768.0
+        return samples
+
+    def _convert_hiragana(self, hiragana_converter, texts: List[str]) -> List[str]:
+        """複数テキストのひらがな変換をまとめて実行
+
+        変換関数はLRUキャッシュでラップし、同一テキストの再変換を避ける。
+
+        Args:
+            hiragana_converter: ひらがな変換関数
+            texts: 変換対象テキストのリスト
+
+        Returns:
+            List[str]: 変換結果のリスト（空文字列は空文字列のまま）
+        """
+        if self._hiragana_converter_source is not hiragana_converter:
+            self._hiragana_converter_source = hiragana_converter
+            self._cached_hiragana_converter = lru_cache(maxsize=256)(hiragana_converter)
+        converter = self._cached_hiragana_converter
+        return [converter(text) if text else "" for text in texts]
 
     def set_on_before_trim_callback(self, callback: callable):
         """トリミング前に呼ばれるコールバックを設定
@@ -428,7 +610,7 @@ class CumulativeBuffer:
         if len(confirmed) > len(new):
             confirmed = confirmed[-len(new) :]
             logger.debug(
-                f"   重複除外: confirmed を末尾{len(confirmed)}文字に絞って比較"
+                "   重複除外: confirmed を末尾%d文字に絞って比較", len(confirmed)
             )
 
         # 方法1: 最長一致（完全一致）
@@ -444,13 +626,13 @@ class CumulativeBuffer:
         if overlap_len > 0:
             result = new[overlap_len:]
             logger.debug(
-                f"   重複除外（完全一致）: {overlap_len}文字一致, 残り={len(result)}文字"
+                "   重複除外（完全一致）: %d文字一致, 残り=%d文字",
+                overlap_len,
+                len(result),
             )
             return result
 
         # 方法2: 類似度ベースの重複検出（Whisperの表記揺れ対応）
-        from difflib import SequenceMatcher
-
         # confirmed_textの末尾とnew_textの先頭を比較
         # 比較範囲: 50〜150文字
         compare_len = min(150, len(confirmed), len(new))
@@ -459,7 +641,7 @@ class CumulativeBuffer:
             new_head = new[:compare_len]
 
             # 類似度を計算（0.0〜1.0）
-            similarity = SequenceMatcher(None, confirmed_tail, new_head).ratio()
+            similarity = _similarity(confirmed_tail, new_head)
 
             # 類似度が75%以上の場合、重複と判定
             if similarity >= 0.75:
@@ -467,9 +649,12 @@ class CumulativeBuffer:
                 estimated_overlap = int(compare_len * similarity)
                 result = new[estimated_overlap:]
                 logger.debug(
-                    f"   重複除外（類似度{similarity:.2%}）: {estimated_overlap}文字スキップ, 残り={len(result)}文字"
+                    "   重複除外（類似度%.2f%%）: %d文字スキップ, 残り=%d文字",
+                    similarity * 100,
+                    estimated_overlap,
+                    len(result),
                 )
-                logger.info(f"   💡 表記揺れを検出しました（類似度: {similarity:.2%}）")
+                logger.info("   💡 表記揺れを検出しました（類似度: %.2f%%）", similarity * 100)
                 return result
 
         # 方法3: 文字数ベース推定（上記が失敗した場合）
@@ -478,15 +663,19 @@ class CumulativeBuffer:
             estimated_skip = len(confirmed)
             result = new[estimated_skip:]
             logger.debug(
-                f"   重複除外（文字数推定）: {estimated_skip}文字スキップ, 残り={len(result)}文字"
+                "   重複除外（文字数推定）: %d文字スキップ, 残り=%d文字",
+                estimated_skip,
+                len(result),
             )
-            logger.warning(f"   ⚠️ 完全一致・類似度検出失敗、文字数ベースで推定しました")
+            logger.warning("   ⚠️ 完全一致・類似度検出失敗、文字数ベースで推定しました")
             return result
         else:
             # new_textがconfirmed_text以下の場合、トリミング後の新しいバッファと判断
             # new_text全体を返す（独立した新しい内容）
             logger.debug(
-                f"   重複除外: new_textが短い（{len(new)} <= {len(confirmed)}）→ 新しいバッファと判断"
+                "   重複除外: new_textが短い（%d <= %d）→ 新しいバッファと判断",
+                len(new),
+                len(confirmed),
             )
             return new
 
@@ -501,6 +690,9 @@ class CumulativeBuffer:
         Returns:
             bool: 確定テキストに移行したかどうか
         """
+        # 確定テキストが変わるため、再利用用の前回結果は無効にする
+        self._last_result = None
+
         # ✅ Phase 12.4: タイムスタンプベースで処理（セグメント情報がある場合）
         if self.last_segments:
             # last_confirmed_segment_end 以降のセグメントを全て確定
@@ -533,16 +725,19 @@ class CumulativeBuffer:
             merged_segs = self._merge_short_segments(abs_segs)
 
             remaining = "".join(s["text"] for s in merged_segs)
-            self.confirmed_text += remaining
+            self._confirmed_text += remaining
             self.last_confirmed_segment_end = merged_segs[-1]["end"]  # 既に絶対タイムスタンプ
 
             if hiragana_converter:
-                self.confirmed_hiragana += hiragana_converter(remaining)
+                self._confirmed_hiragana += self._convert_hiragana(
+                    hiragana_converter, [remaining]
+                )[0]
 
             logger.info(
-                f"🔒 暫定テキストを強制確定（タイムスタンプ）: "
-                f"+{len(remaining)}文字, last_end={self.last_confirmed_segment_end:.1f}s, "
-                f"合計{len(self.confirmed_text)}文字"
+                "🔒 暫定テキストを強制確定（タイムスタンプ）: +%d文字, last_end=%.1fs, 合計%d文字",
+                len(remaining),
+                self.last_confirmed_segment_end,
+                len(self.confirmed_text),
             )
 
             # Phase 12.4: 確定セグメントを _pending_force_segments に保存（update_transcription に渡すため）
@@ -568,14 +763,17 @@ class CumulativeBuffer:
             logger.debug("   強制確定（フォールバック）: 残りなし（スキップ）")
             return False
 
-        self.confirmed_text += remaining
+        self._confirmed_text += remaining
 
         if hiragana_converter:
-            self.confirmed_hiragana += hiragana_converter(remaining)
+            self._confirmed_hiragana += self._convert_hiragana(
+                hiragana_converter, [remaining]
+            )[0]
 
         logger.info(
-            f"🔒 暫定テキストを強制確定（フォールバック）: "
-            f"+{len(remaining)}文字, 合計{len(self.confirmed_text)}文字"
+            "🔒 暫定テキストを強制確定（フォールバック）: +%d文字, 合計%d文字",
+            len(remaining),
+            len(self.confirmed_text),
         )
         return True
 
@@ -589,15 +787,27 @@ class CumulativeBuffer:
             return None
 
         # 最後の10文程度を返す（文脈強化）
-        sentences = re.split(r"(?<=[。！？])", self.confirmed_text)
-        recent_sentences = [s for s in sentences[-10:] if s.strip()]
-        prompt = "".join(recent_sentences)
-
         # 長さ制限（Whisperのトークン制限を考慮: 224トークン ≈ 200文字）
+        # 確定テキスト全体を文分割せず、末尾の max_length 文字だけを走査する
+        max_sentences = 10
         max_length = 200
-        if len(prompt) > max_length:
-            # 末尾から切り取る
-            prompt = prompt[-max_length:]
+        text = self.confirmed_text
+
+        # 最後の文末記号以降が空白のみの場合は除外する
+        end = len(text)
+        while end and text[end - 1].isspace():
+            end -= 1
+        if not end:
+            return None
+        if text[end - 1] not in _SENTENCE_END_CHARS:
+            end = len(text)
+
+        window = text[max(0, end - max_length) : end]
+        sentence_ends = [m.end() for m in _SENTENCE_END_PATTERN.finditer(window)]
+        if len(sentence_ends) >= max_sentences:
+            prompt = window[sentence_ends[-max_sentences] :]
+        else:
+            prompt = window
 
         # ハルシネーション対策: 無効なテキスト（繰り返しパターン等）は除外
         if prompt and not is_valid_text(prompt):
@@ -629,14 +839,30 @@ class CumulativeBuffer:
             self.last_segments = segments
 
         # デバッグログ
-        logger.debug(f"🔍 update_transcription呼び出し (should_trim={should_trim})")
-        logger.debug(
-            f"   前回: {self.last_transcription[:50] if self.last_transcription else '(なし)'}..."
-        )
-        logger.debug(f"   今回: {new_text[:50] if new_text else '(なし)'}...")
-        logger.debug(
-            f"   既存確定: {self.confirmed_text[:50] if self.confirmed_text else '(なし)'}..."
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔍 update_transcription呼び出し (should_trim=%s)", should_trim)
+            logger.debug("   前回: %s...", self.last_transcription[:50] or "(なし)")
+            logger.debug("   今回: %s...", new_text[:50] or "(なし)")
+            logger.debug("   既存確定: %s...", self.confirmed_text[:50] or "(なし)")
+
+        # 前回と同じテキストで、今回も確定・トリミングが起きない場合は前回結果を再利用
+        if (
+            self._last_result is not None
+            and not should_trim
+            and new_text == self.previous_full_text
+            and self.stable_count + 1 < self.config.stable_text_threshold
+        ):
+            self.stable_count += 1
+            logger.debug("   安定カウント: %d（前回結果を再利用）", self.stable_count)
+            last = self._last_result
+            return TranscriptionResult(
+                confirmed_text=last.confirmed_text,
+                tentative_text=last.tentative_text,
+                full_text=last.full_text,
+                confirmed_hiragana=last.confirmed_hiragana,
+                tentative_hiragana=last.tentative_hiragana,
+                is_final=False,
+            )
 
         newly_confirmed = ""
         tentative = new_text
@@ -651,7 +877,7 @@ class CumulativeBuffer:
         # 安定性チェック（同じ結果が連続して出現したら確定）
         if new_text == self.previous_full_text:
             self.stable_count += 1
-            logger.debug(f"   安定カウント: {self.stable_count}")
+            logger.debug("   安定カウント: %d", self.stable_count)
 
             if self.stable_count >= self.config.stable_text_threshold:
                 if self.last_segments:
@@ -686,13 +912,14 @@ class CumulativeBuffer:
                             )
                         else:
                             newly_confirmed = candidate
-                            self.confirmed_text += newly_confirmed
+                            self._confirmed_text += newly_confirmed
                             self.last_confirmed_segment_end = new_segs[-1]["end"]
                             new_confirmed_segments = new_segs
                             self.stable_count = 0
                             logger.debug(
-                                f"   タイムスタンプ確定: {len(new_segs)}セグメント, "
-                                f"last_end={self.last_confirmed_segment_end:.1f}s → stable_count リセット"
+                                "   タイムスタンプ確定: %dセグメント, last_end=%.1fs → stable_count リセット",
+                                len(new_segs),
+                                self.last_confirmed_segment_end,
                             )
 
                     # 暫定テキスト = last_confirmed_segment_end より後のセグメントテキスト
@@ -710,14 +937,10 @@ class CumulativeBuffer:
                         )
 
                         if remaining:
-                            break_points = []
-                            for char in ["。", "！", "？"]:
-                                pos = remaining.find(char)
-                                if pos > 0:
-                                    break_points.append(pos + 1)
-
-                            if break_points:
-                                cut_pos = min(break_points)
+                            break_match = _SENTENCE_END_PATTERN.search(remaining, 1)
+
+                            if break_match:
+                                cut_pos = break_match.end()
                                 newly_confirmed = remaining[:cut_pos]
 
                                 if newly_confirmed and not is_valid_text(
@@ -729,40 +952,38 @@ class CumulativeBuffer:
                                     newly_confirmed = ""
                                     tentative = remaining
                                 else:
-                                    self.confirmed_text += newly_confirmed
+                                    self._confirmed_text += newly_confirmed
                                     tentative = remaining[cut_pos:]
                                     self.stable_count = 0
                                     logger.debug(
-                                        f"   新規確定（フォールバック）: {newly_confirmed[:30]}... → stable_count リセット"
+                                        "   新規確定（フォールバック）: %s... → stable_count リセット",
+                                        newly_confirmed[:30],
                                     )
                             else:
                                 tentative = remaining
                         else:
                             tentative = ""
-                            logger.debug(f"   重複除外後、残りなし")
+                            logger.debug("   重複除外後、残りなし")
                     else:
                         # 初回の確定
-                        break_points = []
-                        for char in ["。", "！", "？"]:
-                            pos = new_text.find(char)
-                            if pos > 0:
-                                break_points.append(pos + 1)
-
-                        if break_points:
-                            cut_pos = min(break_points)
+                        break_match = _SENTENCE_END_PATTERN.search(new_text, 1)
+
+                        if break_match:
+                            cut_pos = break_match.end()
                             newly_confirmed = new_text[:cut_pos]
                             self.confirmed_text = newly_confirmed
                             tentative = new_text[cut_pos:]
                             self.stable_count = 0
                             logger.debug(
-                                f"   初回確定（フォールバック）: {newly_confirmed[:30]}... → stable_count リセット"
+                                "   初回確定（フォールバック）: %s... → stable_count リセット",
+                                newly_confirmed[:30],
                             )
                         else:
                             tentative = new_text
         else:
             # テキストが変わった場合
             self.stable_count = 0
-            logger.debug(f"   テキスト変更 → 安定カウントリセット")
+            logger.debug("   テキスト変更 → 安定カウントリセット")
 
             if self.last_segments:
                 # ✅ Phase 12.4: タイムスタンプベースで暫定テキストを計算
@@ -798,17 +1019,16 @@ class CumulativeBuffer:
                 )
             else:
                 tentative = remove_confirmed_overlap(self.confirmed_text, new_text)
-            logger.debug(f"   トリミング後の暫定テキスト: {len(tentative)}文字")
+            logger.debug("   トリミング後の暫定テキスト: %d文字", len(tentative))
 
         # ひらがな変換
         confirmed_hiragana = ""
         tentative_hiragana = ""
-        if hiragana_converter:
-            if newly_confirmed:
-                confirmed_hiragana = hiragana_converter(newly_confirmed)
-                self.confirmed_hiragana += confirmed_hiragana
-            if tentative:
-                tentative_hiragana = hiragana_converter(tentative)
+        if hiragana_converter and (newly_confirmed or tentative):
+            confirmed_hiragana, tentative_hiragana = self._convert_hiragana(
+                hiragana_converter, [newly_confirmed, tentative]
+            )
+            self._confirmed_hiragana += confirmed_hiragana
 
         # ✅ トリミングを実行（コールバック後にチャンク削除）
         if should_trim:
@@ -818,22 +1038,19 @@ class CumulativeBuffer:
         full_text = self.confirmed_text + tentative
 
         # デバッグログ
-        logger.debug(
-            f"   確定テキスト（先頭50文字）: {self.confirmed_text[:50] if self.confirmed_text else '(なし)'}..."
-        )
-        logger.debug(
-            f"   暫定テキスト（先頭50文字）: {tentative[:50] if tentative else '(なし)'}..."
-        )
-        logger.debug(
-            f"   全体テキスト（先頭50文字）: {full_text[:50] if full_text else '(なし)'}..."
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "   確定テキスト（先頭50文字）: %s...", self.confirmed_text[:50] or "(なし)"
+            )
+            logger.debug("   暫定テキスト（先頭50文字）: %s...", tentative[:50] or "(なし)")
+            logger.debug("   全体テキスト（先頭50文字）: %s...", full_text[:50] or "(なし)")
 
         # 新規確定テキストのタイムスタンプを計算
         if newly_confirmed and new_confirmed_segments:
             # タイムスタンプベース: 最初のセグメントのstartを使用
             confirmed_timestamp = new_confirmed_segments[0]["start"]
             logger.debug(
-                f"   確定タイムスタンプ（タイムスタンプベース）: {confirmed_timestamp:.1f}秒"
+                "   確定タイムスタンプ（タイムスタンプベース）: %.1f秒", confirmed_timestamp
             )
         elif len(self.confirmed_text) > confirmed_text_before and self.last_segments:
             # フォールバック: テキスト位置から計算
@@ -841,7 +1058,7 @@ class CumulativeBuffer:
                 confirmed_text_before, self.last_segments
             )
             logger.debug(
-                f"   確定タイムスタンプ（フォールバック）: {confirmed_timestamp:.1f}秒"
+                "   確定タイムスタンプ（フォールバック）: %.1f秒", confirmed_timestamp
             )
 
             if newly_confirmed and not new_confirmed_segments:
@@ -856,32 +1073,33 @@ class CumulativeBuffer:
             if new_confirmed_segments:
                 confirmed_timestamp = new_confirmed_segments[0]["start"]
                 logger.debug(
-                    f"   確定タイムスタンプ（force_finalize）: {confirmed_timestamp:.1f}秒, "
-                    f"{len(new_confirmed_segments)}セグメント"
+                    "   確定タイムスタンプ（force_finalize）: %.1f秒, %dセグメント",
+                    confirmed_timestamp,
+                    len(new_confirmed_segments),
                 )
 
-        logger.info(
-            f"📝 文字起こし更新: "
-            f"確定={len(self.confirmed_text)}文字, "
-            f"暫定={len(tentative)}文字, "
-            f"全体={len(full_text)}文字, "
-            f"安定={self.stable_count}"
-        )
-
-        # デバッグログ: 返却する確定テキストの詳細
-        logger.info(f"=" * 80)
-        logger.info(f"📤 サーバー→クライアント送信データ:")
-        logger.info(f"   confirmed_text.length: {len(self.confirmed_text)}")
-        logger.info(f"   confirmed_text (全文):")
-        logger.info(f"   「{self.confirmed_text}」")
-        logger.info(f"   tentative_text.length: {len(tentative)}")
-        logger.info(
-            f"   tentative_text (先頭100文字): {tentative[:100] if tentative else '(なし)'}"
-        )
-        logger.info(f"   full_text.length: {len(full_text)}")
-        logger.info(f"=" * 80)
+        # 返却する確定テキストの詳細（確定テキスト全文を含むため、出力されない場合は組み立てない）
+        if logger.isEnabledFor(logging.INFO):
+            confirmed_text = self.confirmed_text
+            logger.info(
+                "📝 文字起こし更新: 確定=%d文字, 暫定=%d文字, 全体=%d文字, 安定=%d",
+                len(confirmed_text),
+                len(tentative),
+                len(full_text),
+                self.stable_count,
+            )
 
-        return TranscriptionResult(
+            logger.info("=" * 80)
+            logger.info("📤 サーバー→クライアント送信データ:")
+            logger.info("   confirmed_text.length: %d", len(confirmed_text))
+            logger.info("   confirmed_text (全文):")
+            logger.info("   「%s」", confirmed_text)
+            logger.info("   tentative_text.length: %d", len(tentative))
+            logger.info("   tentative_text (先頭100文字): %s", tentative[:100] or "(なし)")
+            logger.info("   full_text.length: %d", len(full_text))
+            logger.info("=" * 80)
+
+        self._last_result = TranscriptionResult(
             confirmed_text=self.confirmed_text,
             tentative_text=tentative,
             full_text=full_text,
@@ -891,9 +1109,12 @@ class CumulativeBuffer:
             confirmed_timestamp=confirmed_timestamp,
             new_confirmed_segments=new_confirmed_segments,
         )
+        return self._last_result
 
     def finalize(self, hiragana_converter=None) -> TranscriptionResult:
         """セッション終了時に全テキストを確定"""
+        self._last_result = None
+
         # 残りの暫定テキストを確定
         if self.last_transcription:
             # 確定済みテキストを除いた残り（暫定部分）
@@ -904,11 +1125,13 @@ class CumulativeBuffer:
                 remaining = self.last_transcription
 
             if remaining:
-                self.confirmed_text += remaining
+                self._confirmed_text += remaining
                 if hiragana_converter:
-                    self.confirmed_hiragana += hiragana_converter(remaining)
+                    self._confirmed_hiragana += self._convert_hiragana(
+                        hiragana_converter, [remaining]
+                    )[0]
 
-        logger.info(f"✅ セッション終了: 最終テキスト={len(self.confirmed_text)}文字")
+        logger.info("✅ セッション終了: 最終テキスト=%d文字", len(self.confirmed_text))
 
         return TranscriptionResult(
             confirmed_text=self.confirmed_text,
@@ -921,18 +1144,23 @@ class CumulativeBuffer:
 
     def clear(self):
         """バッファをクリア"""
-        self.audio_chunks.clear()
+        self._pcm_start = 0
+        self._pcm_end = 0
+        self._chunk_sizes.clear()
         self.total_audio_bytes = 0
         self.chunk_count = 0
         self.last_transcription = ""
-        self.confirmed_text = ""
-        self.confirmed_hiragana = ""
+        self._confirmed_text = ""
+        self._confirmed_hiragana = ""
         self.stable_count = 0
         self.previous_full_text = ""
         self.trimmed_audio_seconds = 0.0
         self.last_segments = []
         self.last_confirmed_segment_end = 0.0
         self._pending_force_segments = []
+        self._last_result = None
+        self._hiragana_converter_source = None
+        self._cached_hiragana_converter = None
         logger.info("🧹 CumulativeBufferをクリア")
 
     def get_stats(self) -> dict:
@@ -17,11 +17,13 @@ UNITS = [
     "適量",
 ]
 
-UNIT_PATTERN = "|".join(UNITS)
+# 長い単位から順に試行し、短い単位での不要な再試行を避ける
+UNIT_PATTERN = "|".join(re.escape(unit) for unit in sorted(UNITS, key=len, reverse=True))
 
+# 品名は所有量指定子（{2,}+）でバックトラックを抑止する
 ITEM_PATTERN = re.compile(
     rf"""
-    (?P<item>[ぁ-ん一-龥ー]{2,})
+    (?P<item>[ぁ-ん一-龥ー]{{2,}}+)
     \s*
     (?P<quantity>\d+)?
     \s*
@@ -32,37 +34,17 @@ ITEM_PATTERN = re.compile(
 
 
 def parse_inventory(text: str) -> Dict[str, List[Dict]]:
-    items = []
-
-    for match in ITEM_PATTERN.finditer(text):
-        item = match.group("item")
-        quantity = match.group("quantity")
-        unit = match.group("unit")
-
-        # 品名ノイズ除去（数字混じり・短すぎ防止）
-        if not _is_valid_item_name(item):
-            continue
-
-        items.append(
-            {
-                "name": item,
-                "quantity": int(quantity) if quantity else 1,
-                "unit": unit or "個",
-            }
-        )
+    # 品名ノイズ除去（短すぎ・同一文字の連続）はインラインで判定する
+    items = [
+        {
+            "name": match["item"],
+            "quantity": int(match["quantity"]) if match["quantity"] else 1,
+            "unit": match["unit"] or "個",
+        }
+        for match in ITEM_PATTERN.finditer(text)
+        if len(match["item"]) >= 2 and len(set(match["item"])) > 1
+    ]
 
     logger.info(f"🔍 解析結果: {items}")
 
     return {"items": items}
-
-
-def _is_valid_item_name(item: str) -> bool:
-    # 2文字未満は不可
-    if len(item) < 2:
-        return False
-
-    # 同一文字の連続（雑音対策）
-    if len(set(item)) == 1:
-        return False
-
-    return True
@@ -1,16 +1,54 @@
 import json
+import logging
+import random
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from config import settings
 from utils.logger import logger
 from urllib.parse import urljoin
 
+# JSONのエンコード・デコードはC実装の orjson を優先（未インストール時は標準の json で代替）
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 OLLAMA_BASE_URL = settings.OLLAMA_BASE_URL
 OLLAMA_URL = urljoin(OLLAMA_BASE_URL.rstrip("/") + "/", "api/chat")
 MODEL_NAME = settings.OLLAMA_MODEL
 
+# Ollamaへの接続を使い回すためのセッション（呼び出しごとのTCP接続確立を避ける）
+# pool_block=True: 同時実行数を超えた呼び出しは使い捨て接続を作らず、空いた接続を待つ
+# （urllib3 は既定で TCP_NODELAY を設定するため、Nagle による遅延はない）
+_session = requests.Session()
+_session.mount(
+    "http://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=max(1, settings.OLLAMA_CONCURRENCY),
+        pool_block=True,
+    ),
+)
+
+# LLM応答からJSONを取り出すためのデコーダー（コードフェンス等の前後の文字列は読み飛ばす）
+_JSON_DECODER = json.JSONDecoder()
+
 # SYSTEM_PROMPT = """You are a Japanese Hiragana-to-Kanji converter.
 # Convert the input Hiragana text into natural Japanese with appropriate Kanji.
 
@@ -45,87 +83,325 @@ SYSTEM_PROMPT = """あなたは日本語のひらがなを漢字かな混じり
 重要: 入力文を要約せず、全ての文字を変換してください。JSONのみを出力してください。"""
 
 
+# コンテキスト長（既定の2048は不要に大きいため、プロンプト+最大チャンク+出力分に絞る）
+# リクエストごとに値が変わるとOllamaがモデルを再ロードするため、起動時に一度だけ決める
+# 日本語は概ね1文字≒1トークン以下なので文字数で見積もり、256単位で切り上げる
+def _estimate_num_ctx() -> int:
+    tokens = len(SYSTEM_PROMPT) + settings.MAX_TEXT_LENGTH * 2 + settings.OLLAMA_NUM_PREDICT
+    return max(512, -(-tokens // 256) * 256)
+
+
+_NUM_CTX = settings.OLLAMA_NUM_CTX or _estimate_num_ctx()
+
+
+# リクエストごとに変わらない部分は起動時に一度だけ組み立てる
+# システムプロンプトを独立したメッセージにして全リクエストで同一の先頭にし、
+# Ollamaのプロンプトキャッシュ（KV）を再利用させる
+_SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+_BASE_PAYLOAD = {
+    "model": MODEL_NAME,
+    "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+    "options": {
+        "temperature": settings.OLLAMA_TEMPERATURE,  # Gemma2は少し高めが良い
+        "top_k": settings.OLLAMA_TOP_K,
+        "top_p": settings.OLLAMA_TOP_P,
+        "repeat_penalty": settings.OLLAMA_REPEAT_PENALTY,
+        "num_predict": settings.OLLAMA_NUM_PREDICT,
+        "num_ctx": _NUM_CTX,
+    },
+    "stream": True,
+}
+
+
+# 変換結果のLRU+TTLキャッシュ（再文字起こしで同じ入力が繰り返し送られるため）
+# キーは (モデル名, NFKC正規化・前後空白除去した入力)
+# エラー結果と、空応答などで信頼度0に落ちた結果はキャッシュしない
+_LLM_CACHE_SIZE = 1024
+_llm_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_llm_cache_lock = threading.Lock()
+# 処理中のリクエスト（キー → 結果のFuture）
+_llm_inflight: "dict[tuple, Future]" = {}
+
+
+def _llm_cache_key(text: str) -> tuple:
+    return (MODEL_NAME, unicodedata.normalize("NFKC", text).strip())
+
+
+# 変換対象のひらがなを含むかの判定用
+_HIRAGANA_PATTERN = re.compile(r"[ぁ-ん]")
+
+
+def _needs_conversion(text: str) -> bool:
+    """LLMに送る必要があるか（1文字以下やひらがなを含まないチャンクは変換不要）"""
+    return len(text.strip()) >= 2 and _HIRAGANA_PATTERN.search(text) is not None
+
+
+def _is_cacheable(result: dict) -> bool:
+    """LLMが返したJSONから得た結果か（空応答・パース失敗時のフォールバックは除く）"""
+    return "error" not in result and result["confidence"] > 0.0
+
+
 def call_llm(text: str) -> dict:
+    if not _needs_conversion(text):
+        logger.debug("LLM skipped (no conversion needed): %r", text)
+        return {"text": text, "confidence": 1.0}
+
+    key = _llm_cache_key(text)
+    now = time.monotonic()
+
+    with _llm_cache_lock:
+        entry = _llm_cache.get(key)
+        if entry is not None:
+            expires_at, cached = entry
+            if expires_at > now:
+                _llm_cache.move_to_end(key)
+                logger.debug("LLM cache hit: %d chars", len(text))
+                return dict(cached)
+            del _llm_cache[key]
+
+        # 同じ入力が処理中なら、その結果を待って共有する（同時リクエストの重複送信を避ける）
+        pending = _llm_inflight.get(key)
+        if pending is None:
+            future: Future = Future()
+            _llm_inflight[key] = future
+
+    if pending is not None:
+        logger.debug("LLM in-flight hit: %d chars", len(text))
+        result = pending.result()
+        # エラー時は呼び出し元の入力をそのまま返す
+        return {**result, "text": text} if "error" in result else dict(result)
+
+    try:
+        result = _request_llm(text)
+    except BaseException as e:
+        with _llm_cache_lock:
+            del _llm_inflight[key]
+        future.set_exception(e)
+        raise
+
+    with _llm_cache_lock:
+        if _is_cacheable(result):
+            _llm_cache[key] = (now + settings.OLLAMA_CACHE_TTL, dict(result))
+            _llm_cache.move_to_end(key)
+            if len(_llm_cache) > _LLM_CACHE_SIZE:
+                _llm_cache.popitem(last=False)
+        del _llm_inflight[key]
+    future.set_result(dict(result))
+
+    return result
+
+
+def _request_llm(text: str) -> dict:
+    content = ""
     try:
         payload = {
-            "model": MODEL_NAME,
+            **_BASE_PAYLOAD,
             "messages": [
-                {"role": "user", "content": f"{SYSTEM_PROMPT}\n\n入力: {text}\n出力:"}
+                _SYSTEM_MESSAGE,
+                {"role": "user", "content": f"入力: {text}\n出力:"},
             ],
-            "options": {
-                "temperature": settings.OLLAMA_TEMPERATURE,  # Gemma2は少し高めが良い
-                "top_k": settings.OLLAMA_TOP_K,
-                "top_p": settings.OLLAMA_TOP_P,
-                "repeat_penalty": settings.OLLAMA_REPEAT_PENALTY,
-                "num_predict": settings.OLLAMA_NUM_PREDICT,
-            },
-            "stream": False,
         }
 
-        response = requests.post(
-            OLLAMA_URL, json=payload, timeout=settings.OLLAMA_TIMEOUT
-        )
-        response.raise_for_status()
-        data = response.json()
+        content = _post_chat_with_retry(_json_dumps(payload)) or "{}"
 
-        content = data.get("message", {}).get("content", "{}")
-        logger.debug(f"Raw LLM response: {content}")
+        logger.debug("Raw LLM response: %s", content)
 
         # JSONを抽出
-        clean_content = re.sub(r"```(?:json)?\s*|\s*```", "", content).strip()
-        json_match = re.search(r'\{[^{}]*"text"[^{}]*\}', clean_content)
-
-        if json_match:
-            clean_content = json_match.group(0)
-
-        parsed = json.loads(clean_content)
+        parsed = _extract_json_object(content)
         return {
             "text": parsed.get("text", text),
             "confidence": float(parsed.get("confidence", 0.0)),
         }
 
     except requests.exceptions.RequestException as e:
-        logger.error(f"❌ Network error: {e}")
+        logger.error("❌ Network error: %s", e)
         return {"text": text, "confidence": 0.0, "error": str(e)}
     except (json.JSONDecodeError, ValueError, KeyError) as e:
-        logger.error(f"❌ Parse error: {e}")
-        logger.error(f"   Content: {content}")
+        logger.error("❌ Parse error: %s", e)
+        logger.error("   Content: %s", content)
         return {"text": text, "confidence": 0.0, "error": str(e)}
     except Exception as e:
-        logger.error(f"❌ Unexpected error: {e}", exc_info=True)
+        logger.error("❌ Unexpected error: %s", e, exc_info=True)
         return {"text": text, "confidence": 0.0, "error": str(e)}
 
 
+# 一時的なエラー（接続断・タイムアウト・5xx）とみなして再試行する例外
+_RETRYABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.HTTPError,
+)
+
+
+def _post_chat_with_retry(body: bytes) -> str:
+    """Ollamaにリクエストを送り、一時的なエラーは指数バックオフで再試行する
+
+    再試行の待ち時間の合計が OLLAMA_RETRY_BUDGET を超える場合は諦めて例外を送出する。
+    各リクエスト自体の所要時間は OLLAMA_TIMEOUT で制限されるため予算には含めない
+    （含めるとタイムアウトした時点で予算を使い切り、再試行されなくなる）。
+    """
+    backoff_total = 0.0  # これまでの再試行待ち時間の合計
+    attempt = 0
+    while True:
+        try:
+            with _session.post(
+                OLLAMA_URL,
+                data=body,
+                headers=_JSON_HEADERS,
+                timeout=settings.OLLAMA_TIMEOUT,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                return _read_streamed_content(response)
+        except _RETRYABLE_ERRORS as e:
+            # 4xx はリクエスト自体の問題のため再試行しない
+            status = getattr(e.response, "status_code", None)
+            if status is not None and status < 500:
+                raise
+
+            delay = min(2.0, 0.2 * 2**attempt) + random.uniform(0, 0.2)
+            if (
+                attempt >= settings.OLLAMA_MAX_RETRIES
+                or backoff_total + delay > settings.OLLAMA_RETRY_BUDGET
+            ):
+                raise
+
+            attempt += 1
+            backoff_total += delay
+            logger.warning(
+                "⚠️ Ollamaリクエスト失敗、%.1f秒後に再試行 (%d/%d): %s",
+                delay,
+                attempt,
+                settings.OLLAMA_MAX_RETRIES,
+                e,
+            )
+            time.sleep(delay)
+
+
+def _extract_json_object(content: str) -> dict:
+    """LLM応答から "text" キーを含む最初のJSONオブジェクトを取り出す
+
+    "{" の位置から raw_decode を試す一回の走査で、正規表現による前処理は行わない。
+    "text" を含むオブジェクトがなければ最初に読めたオブジェクトを返す。
+    """
+    first = None
+    idx = content.find("{")
+    while idx != -1:
+        try:
+            obj, end = _JSON_DECODER.raw_decode(content, idx)
+        except json.JSONDecodeError:
+            idx = content.find("{", idx + 1)
+            continue
+
+        if isinstance(obj, dict) and "text" in obj:
+            return obj
+        if first is None and isinstance(obj, dict):
+            first = obj
+        # ネストしたオブジェクトに "text" がある場合に備え、内側も走査する
+        idx = content.find("{", idx + 1)
+
+    if first is None:
+        raise ValueError("LLM応答にJSONオブジェクトがありません")
+    return first
+
+
+def _read_streamed_content(response) -> str:
+    """Ollamaのストリーミング応答を読み、"text" を含むJSONオブジェクトが閉じた時点で打ち切る
+
+    JSON出力後もモデルが生成を続ける場合があるため、残りの生成を待たずに接続を閉じる。
+    括弧の対応が取れた時点で raw_decode し、目的のオブジェクトでなければ読み続ける。
+    """
+    parts = []
+    length = 0  # これまでに受信した文字数
+    depth = 0
+    obj_start = -1  # 走査中のオブジェクトの開始位置
+    in_string = False
+    escaped = False
+
+    for line in response.iter_lines():
+        if not line:
+            continue
+
+        data = _json_loads(line)
+        token = data.get("message", {}).get("content", "")
+        parts.append(token)
+
+        # 文字列リテラル内の括弧を数えないよう簡易的に走査する
+        found = False
+        for i, ch in enumerate(token):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = obj_start >= 0
+            elif ch == "{":
+                if obj_start < 0:
+                    obj_start = length + i
+                depth += 1
+            elif ch == "}" and obj_start >= 0:
+                depth -= 1
+                if depth == 0:
+                    content = "".join(parts)
+                    parts = [content]
+                    try:
+                        obj, _ = _JSON_DECODER.raw_decode(content, obj_start)
+                    except json.JSONDecodeError:
+                        obj = None
+                    if isinstance(obj, dict) and "text" in obj:
+                        found = True
+                        break
+                    # 目的のオブジェクトではないため、次の "{" から走査し直す
+                    obj_start = -1
+        length += len(token)
+
+        if found:
+            logger.debug("LLM stream: JSON完了、残りの生成を打ち切り")
+            break
+
+        if data.get("done"):
+            break
+
+    return "".join(parts)
+
+
+# 助詞・接続詞のパターン (後ろで分割可能な位置)
+_SPLIT_PATTERN = re.compile(r"([。、]|(?<=[はがをにへでとからよりまで])(?=[ぁ-ん]))")
+
+
 def smart_split(text: str, max_size: int = 50) -> list[str]:
 
     if len(text) <= max_size:
         return [text]
 
-    # 助詞・接続詞のパターン (後ろで分割可能な位置)
-    split_pattern = r"([。、]|(?<=[はがをにへでとからよりまで])(?=[ぁ-ん]))"
-
     # 分割候補を作成
-    parts = re.split(split_pattern, text)
+    parts = _SPLIT_PATTERN.split(text)
 
+    # 文字列を連結せず、元のテキスト上の位置だけを進めてチャンクごとに一度スライスする
     chunks = []
-    current = ""
+    start = 0  # 現在のチャンクの開始位置
+    end = 0  # 現在のチャンクの終了位置
 
     for part in parts:
         if not part:
             continue
 
         # 結合しても制限内なら結合
-        if len(current) + len(part) <= max_size:
-            current += part
+        if end - start + len(part) <= max_size:
+            end += len(part)
         else:
             # 制限を超える場合
-            if current:
-                chunks.append(current)
-            current = part
+            if end > start:
+                chunks.append(text[start:end])
+            start = end
+            end += len(part)
 
     # 残りを追加
-    if current:
-        chunks.append(current)
+    if end > start:
+        chunks.append(text[start:end])
 
     # 分割できなかった場合は強制分割
     if len(chunks) == 1 and len(chunks[0]) > max_size:
@@ -142,13 +418,13 @@ def analyze_with_llm(text: str) -> dict:
 
     # 短い場合は分割しない
     if len(text) <= max_chunk_size:
-        logger.info(f"📝 Processing full text ({len(text)} chars)")
+        logger.info("📝 Processing full text (%d chars)", len(text))
         result = call_llm(text)
 
         elapsed = time.perf_counter() - start_time
-        logger.info(f"✅ Result: {result['text']}")
-        logger.info(f"📊 Confidence: {result['confidence']:.2f}")
-        logger.info(f"⏱️  Time: {elapsed:.2f}s")
+        logger.info("✅ Result: %s", result["text"])
+        logger.info("📊 Confidence: %.2f", result["confidence"])
+        logger.info("⏱️  Time: %.2fs", elapsed)
 
         return {
             "normalized": text,
@@ -161,38 +437,46 @@ def analyze_with_llm(text: str) -> dict:
     # 長い場合は分割して処理
     chunks = smart_split(text, max_size=max_chunk_size)
 
-    logger.info(f"📦 Split into {len(chunks)} chunks:")
-    for i, chunk in enumerate(chunks):
-        logger.info(f"  [{i+1}] '{chunk}' ({len(chunk)} chars)")
+    logger.info("📦 Split into %d chunks:", len(chunks))
+    if logger.isEnabledFor(logging.INFO):
+        for i, chunk in enumerate(chunks):
+            logger.info("  [%d] '%s' (%d chars)", i + 1, chunk, len(chunk))
 
-    results = []
-    confidences = []
+    results = [""] * len(chunks)
+    conf_sum = 0.0  # 失敗したチャンクは信頼度0として平均に含める
     failed = 0
 
-    for i, chunk in enumerate(chunks):
-        logger.info(f"🔄 Processing chunk {i+1}/{len(chunks)}...")
-        result = call_llm(chunk)
+    # チャンクごとのLLM呼び出しを並列実行（HTTP待ちの間はGILが解放される）
+    # 単一のOllamaインスタンスに負荷をかけすぎないよう同時実行数を制限する
+    max_workers = max(1, min(len(chunks), settings.OLLAMA_CONCURRENCY))
+    logger.info("🔄 Processing %d chunks (concurrency=%d)...", len(chunks), max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        chunk_results = list(executor.map(call_llm, chunks))
 
+    for i, (chunk, result) in enumerate(zip(chunks, chunk_results)):
         if "error" in result:
             failed += 1
-            results.append(chunk)
-            confidences.append(0.0)
+            results[i] = chunk
         else:
-            results.append(result["text"])
-            confidences.append(result["confidence"])
+            results[i] = result["text"]
+            conf_sum += result["confidence"]
 
-        logger.info(
-            f"  ✓ [{i+1}] {result['text'][:50]}... (conf: {result['confidence']:.2f})"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "  ✓ [%d] %s... (conf: %.2f)",
+                i + 1,
+                result["text"][:50],
+                result["confidence"],
+            )
 
     final_text = "".join(results)
-    avg_conf = sum(confidences) / len(confidences) if confidences else 0.0
+    avg_conf = conf_sum / len(chunks) if chunks else 0.0
     elapsed = time.perf_counter() - start_time
 
     logger.info("=" * 60)
-    logger.info(f"✅ Final result: {final_text}")
-    logger.info(f"📊 Avg confidence: {avg_conf:.2f}")
-    logger.info(f"⏱️  Total time: {elapsed:.2f}s")
+    logger.info("✅ Final result: %s", final_text)
+    logger.info("📊 Avg confidence: %.2f", avg_conf)
+    logger.info("⏱️  Total time: %.2fs", elapsed)
 
     return {
         "normalized": text,
@@ -1,13 +1,17 @@
+import asyncio
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from itertools import islice
+import threading
+from typing import Deque, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
-import uuid
+import secrets
 from utils.logger import logger
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChunkData:
-    """チャンクデータの構造"""
+    """チャンクデータの構造（生成後は変更しない）"""
 
     chunk_id: int
     timestamp: float
@@ -17,32 +21,51 @@ class ChunkData:
     processing_time: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """セッションデータの構造"""
 
     session_id: str
     created_at: datetime
     last_updated: datetime
-    chunks: List[ChunkData] = field(default_factory=list)
+    # 上限付きリングバッファ（上限超過時は最古のチャンクから自動で破棄）
+    chunks: Deque[ChunkData] = field(default_factory=lambda: deque(maxlen=100))
     total_chunks: int = 0
+    # 文脈テキストのキャッシュ（limit -> (計算時のtotal_chunks, テキスト)）
+    _context_cache: Dict[int, Tuple[int, str]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    # 文脈生成用に原文だけを並行して保持（chunksと同じ上限）
+    original_texts: Deque[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.original_texts = deque(
+            (chunk.original_text for chunk in self.chunks),
+            maxlen=getattr(self.chunks, "maxlen", None),
+        )
 
     def add_chunk(self, chunk_data: ChunkData):
         """チャンクを追加"""
         self.chunks.append(chunk_data)
+        self.original_texts.append(chunk_data.original_text)
         self.total_chunks += 1
+        self._context_cache.clear()
         self.last_updated = datetime.now()
 
     def get_recent_chunks(self, limit: int = 10) -> List[ChunkData]:
         """最新のN件のチャンクを取得"""
-        return self.chunks[-limit:] if len(self.chunks) > limit else self.chunks
+        return list(islice(self.chunks, max(0, len(self.chunks) - limit), None))
 
     def get_context_text(self, limit: int = 3) -> str:
         """前のチャンクからの文脈テキストを取得（翻訳時の文脈として使用）"""
-        recent = self.get_recent_chunks(limit)
-        if not recent:
-            return ""
-        return " ".join([chunk.original_text for chunk in recent])
+        cached = self._context_cache.get(limit)
+        if cached is not None and cached[0] == self.total_chunks:
+            return cached[1]
+
+        texts = self.original_texts
+        context = " ".join(islice(texts, max(0, len(texts) - limit), None))
+        self._context_cache[limit] = (self.total_chunks, context)
+        return context
 
     def is_expired(self, timeout_minutes: int = 30) -> bool:
         """セッションがタイムアウトしているか確認"""
@@ -55,6 +78,8 @@ class SessionManager:
 
     def __init__(self, timeout_minutes: int = 30, max_chunks_per_session: int = 100):
         self.sessions: Dict[str, Session] = {}
+        # sessions辞書の操作を保護するロック（ロック内から他のメソッドを呼べるよう再入可能）
+        self._lock = threading.RLock()
         self.timeout_minutes = timeout_minutes
         self.max_chunks_per_session = max_chunks_per_session
         logger.info(
@@ -64,36 +89,37 @@ class SessionManager:
     def create_session(self, session_id: Optional[str] = None) -> str:
         """新規セッションを作成"""
         if session_id is None:
-            session_id = str(uuid.uuid4())
-
-        if session_id in self.sessions:
+            session_id = secrets.token_hex(8)  # 64bitの乱数による16桁の16進ID
+
+        with self._lock:
+            exists = session_id in self.sessions
+            if not exists:
+                now = datetime.now()
+                self.sessions[session_id] = Session(
+                    session_id=session_id,
+                    created_at=now,
+                    last_updated=now,
+                    chunks=deque(maxlen=self.max_chunks_per_session),
+                    total_chunks=0,
+                )
+
+        if exists:
             logger.warning(f"⚠️ セッションID {session_id} は既に存在します")
             return session_id
 
-        now = datetime.now()
-        self.sessions[session_id] = Session(
-            session_id=session_id,
-            created_at=now,
-            last_updated=now,
-            chunks=[],
-            total_chunks=0,
-        )
         logger.info(f"✅ 新規セッション作成: {session_id}")
         return session_id
 
     def get_session(self, session_id: str) -> Optional[Session]:
         """セッションを取得"""
-        session = self.sessions.get(session_id)
+        # 期限切れの判定は cleanup_loop による定期掃除に任せ、ここでは辞書参照のみ行う
+        with self._lock:
+            session = self.sessions.get(session_id)
+
         if session is None:
             logger.warning(f"⚠️ セッションID {session_id} が見つかりません")
             return None
 
-        # 期限切れチェック
-        if session.is_expired(self.timeout_minutes):
-            logger.info(f"🗑️ セッション {session_id} は期限切れのため削除します")
-            self.delete_session(session_id)
-            return None
-
         return session
 
     def add_chunk_to_session(
@@ -114,14 +140,11 @@ class SessionManager:
             )
             return False
 
-        # 最大チャンク数チェック
+        # 最大チャンク数に達している場合、追加時に最古のチャンクがdequeから押し出される
         if len(session.chunks) >= self.max_chunks_per_session:
-            logger.warning(
-                f"⚠️ セッション {session_id} が最大チャンク数に達しました。古いチャンクを削除します"
+            logger.debug(
+                f"⚠️ セッション {session_id} が最大チャンク数に達しました。最古のチャンクを削除します"
             )
-            # 古いチャンクを削除（FIFOで半分削除）
-            keep_count = self.max_chunks_per_session // 2
-            session.chunks = session.chunks[-keep_count:]
 
         chunk_data = ChunkData(
             chunk_id=chunk_id,
@@ -131,7 +154,8 @@ class SessionManager:
             translated_text=translated_text,
             processing_time=processing_time,
         )
-        session.add_chunk(chunk_data)
+        with self._lock:
+            session.add_chunk(chunk_data)
         logger.info(
             f"📝 セッション {session_id} にチャンク {chunk_id} を追加（合計: {session.total_chunks}チャンク）"
         )
@@ -139,8 +163,10 @@ class SessionManager:
 
     def delete_session(self, session_id: str) -> bool:
         """セッションを削除"""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        with self._lock:
+            removed = self.sessions.pop(session_id, None) is not None
+
+        if removed:
             logger.info(f"🗑️ セッション {session_id} を削除しました")
             return True
         logger.warning(f"⚠️ セッション {session_id} が見つかりません")
@@ -148,14 +174,15 @@ class SessionManager:
 
     def cleanup_expired_sessions(self) -> int:
         """期限切れのセッションをクリーンアップ"""
-        expired_sessions = [
-            sid
-            for sid, session in self.sessions.items()
-            if session.is_expired(self.timeout_minutes)
-        ]
-
-        for session_id in expired_sessions:
-            self.delete_session(session_id)
+        # 列挙と削除を同じロック内でまとめて行う（反復中の辞書変更を防ぐ）
+        with self._lock:
+            expired_sessions = [
+                sid
+                for sid, session in self.sessions.items()
+                if session.is_expired(self.timeout_minutes)
+            ]
+            for session_id in expired_sessions:
+                self.sessions.pop(session_id, None)
 
         if expired_sessions:
             logger.info(
@@ -164,9 +191,19 @@ class SessionManager:
 
         return len(expired_sessions)
 
+    async def cleanup_loop(self, interval_seconds: float = 30.0):
+        """期限切れセッションを定期的に掃除するバックグラウンドループ"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                self.cleanup_expired_sessions()
+            except Exception as e:
+                logger.exception(f"❌ セッションクリーンアップ中にエラー発生: {e}")
+
     def get_session_count(self) -> int:
         """現在のセッション数を取得"""
-        return len(self.sessions)
+        with self._lock:
+            return len(self.sessions)
 
     def get_session_info(self, session_id: str) -> Optional[Dict]:
         """セッション情報を取得"""
@@ -174,13 +211,14 @@ class SessionManager:
         if session is None:
             return None
 
-        return {
-            "session_id": session.session_id,
-            "created_at": session.created_at.isoformat(),
-            "last_updated": session.last_updated.isoformat(),
-            "total_chunks": session.total_chunks,
-            "chunks_in_memory": len(session.chunks),
-        }
+        with self._lock:
+            return {
+                "session_id": session.session_id,
+                "created_at": session.created_at.isoformat(),
+                "last_updated": session.last_updated.isoformat(),
+                "total_chunks": session.total_chunks,
+                "chunks_in_memory": len(session.chunks),
+            }
 
 
 # シングルトンインスタンス
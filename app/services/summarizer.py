@@ -3,13 +3,22 @@
 プロバイダー切り替え対応: Ollama / Gemini
 """
 
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
 from urllib.parse import urljoin
 
 from config import settings
 from utils.logger import logger
 
+OLLAMA_CHAT_URL = urljoin(settings.OLLAMA_BASE_URL.rstrip("/") + "/", "api/chat")
+
+# 要約リクエスト用のセッション（Ollamaへの接続をkeep-aliveで使い回す）
+_session = requests.Session()
+_session.headers["Connection"] = "keep-alive"
+_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 # システムプロンプト（共通）
 SUMMARY_SYSTEM_PROMPT = """あなたは日本語テキストの要約AIです。
 入力は音声の文字起こしのため、誤字・脱字・フィラーが含まれます。
@@ -60,8 +69,6 @@ async def summarize_text(text: str, api_key: Optional[str] = None) -> str:
 async def _summarize_with_ollama(text: str) -> str:
     """Ollamaで要約を実行"""
     try:
-        ollama_url = urljoin(settings.OLLAMA_BASE_URL.rstrip("/") + "/", "api/chat")
-
         payload = {
             "model": settings.OLLAMA_SUMMARY_MODEL,
             "messages": [
@@ -89,8 +96,12 @@ async def _summarize_with_ollama(text: str) -> str:
             "stream": False,
         }
 
-        response = requests.post(
-            ollama_url, json=payload, timeout=settings.OLLAMA_TIMEOUT
+        # requests はブロッキングのため、イベントループを止めないようスレッドで実行
+        response = await asyncio.to_thread(
+            _session.post,
+            OLLAMA_CHAT_URL,
+            json=payload,
+            timeout=settings.OLLAMA_TIMEOUT,
         )
         response.raise_for_status()
         data = response.json()
@@ -107,8 +118,26 @@ async def _summarize_with_ollama(text: str) -> str:
         raise
 
 
+# サーバー設定のAPIキー用Geminiモデル（クライアント接続を要約リクエスト間で使い回す）
+# リクエストごとに指定されるAPIキーはメモリに残さないためキャッシュしない
+_default_gemini_model = None
+
+
+def _create_gemini_model(genai):
+    """要約用のGeminiモデルを生成"""
+    return genai.GenerativeModel(
+        settings.GEMINI_MODEL,
+        generation_config=genai.GenerationConfig(
+            max_output_tokens=settings.GEMINI_MAX_OUTPUT_TOKENS,
+            temperature=settings.GEMINI_TEMPERATURE,
+        ),
+        system_instruction=SUMMARY_SYSTEM_PROMPT,
+    )
+
+
 async def _summarize_with_gemini(text: str, api_key: Optional[str] = None) -> str:
     """Gemini APIで要約を実行"""
+    global _default_gemini_model
     try:
         import google.generativeai as genai
     except ImportError:
@@ -121,15 +150,14 @@ async def _summarize_with_gemini(text: str, api_key: Optional[str] = None) -> st
         raise ValueError("GEMINI_API_KEYが設定されていません")
 
     try:
+        # configure はグローバル設定のため、モデルの再利用有無にかかわらず毎回キーを設定する
         genai.configure(api_key=key)
-        model = genai.GenerativeModel(
-            settings.GEMINI_MODEL,
-            generation_config=genai.GenerationConfig(
-                max_output_tokens=settings.GEMINI_MAX_OUTPUT_TOKENS,
-                temperature=settings.GEMINI_TEMPERATURE,
-            ),
-            system_instruction=SUMMARY_SYSTEM_PROMPT,
-        )
+        if key == settings.GEMINI_API_KEY:
+            if _default_gemini_model is None:
+                _default_gemini_model = _create_gemini_model(genai)
+            model = _default_gemini_model
+        else:
+            model = _create_gemini_model(genai)
 
         response = await model.generate_content_async(
             f"以下の文字起こしテキストを要約してください:\n\n{text}"
@@ -1,33 +1,50 @@
 import re
 from collections import Counter
+from functools import lru_cache
+
+import numpy as np
 
 # よくある相槌・フィラー（意味を持たない）
 FILLER_PATTERNS = [
     r"^(あ+|え+|う+|ん+)$",
     r"(えー+|あの+|その+)",
 ]
+# フィラー判定用に1本の正規表現へまとめて事前コンパイル
+_FILLER_RE = re.compile("|".join(f"(?:{p})" for p in FILLER_PATTERNS))
 
 # 日本語として最低限意味を持ちそうな品詞的特徴
 MEANINGFUL_PATTERN = re.compile(r"[ぁ-ん一-龥]")
+# 判定ごとの属性参照を省くため search メソッドを束縛しておく
+_has_meaningful_char = MEANINGFUL_PATTERN.search
+
+# この文字数以上のテキストではロールハッシュで繰り返しを検出する
+_ROLLING_HASH_MIN_LEN = 80
+_HASH_BASE = np.uint64(1_000_003)
 
 
 def is_valid_text(text: str) -> bool:
-    text = text.strip()
+    # 前後の空白違いでも同じキャッシュを使えるよう、正規化してから判定する
+    return _is_valid_stripped_text(text.strip())
+
 
+@lru_cache(maxsize=4096)
+def _is_valid_stripped_text(text: str) -> bool:
     # 日本語要素がほぼ無い
-    if not MEANINGFUL_PATTERN.search(text):
+    if not _has_meaningful_char(text):
         return False
 
     # フィラーのみ
-    for pattern in FILLER_PATTERNS:
-        if re.fullmatch(pattern, text):
-            return False
+    if _FILLER_RE.fullmatch(text):
+        return False
 
     # 同一文字の異常な繰り返し（雑音）
-    counts = Counter(text)
-    most_common_char, freq = counts.most_common(1)[0]
-    if freq / len(text) > 0.7:
-        return False
+    # 1文字が70%超を占めるなら文字種は 0.3 * 長さ + 1 未満に収まるため、
+    # 文字種が多いテキストは頻度の集計自体を省略する
+    if len(set(text)) < 0.3 * len(text) + 1:
+        counts = Counter(text)
+        most_common_char, freq = counts.most_common(1)[0]
+        if freq / len(text) > 0.7:
+            return False
 
     # 繰り返し単語・フレーズの検出（ハルシネーション対策）
     if _has_repeated_phrases(text):
@@ -51,25 +68,45 @@ def _has_repeated_phrases(text: str, min_phrase_len: int = 3, max_phrase_len: in
     if text_len < min_phrase_len:
         return False
 
-    # 様々な長さのN-gramで繰り返しをチェック
-    for phrase_len in range(min_phrase_len, min(max_phrase_len + 1, text_len // 2 + 1)):
-        # N-gramを生成
-        ngrams = []
-        for i in range(text_len - phrase_len + 1):
-            ngrams.append(text[i:i + phrase_len])
+    max_len = min(max_phrase_len, text_len // 2)
+    if text_len < _ROLLING_HASH_MIN_LEN:
+        # 短いテキストはN-gramを直接数える方が速い
+        return any(
+            _is_repeated(_max_ngram_freq(text, phrase_len), phrase_len, text_len)
+            for phrase_len in range(min_phrase_len, max_len + 1)
+        )
+
+    # 長いテキストはN-gramのハッシュを長さごとに1文字ずつ伸ばしてnumpyで集計
+    # h_L[i] = h_{L-1}[i] * B + code[i + L - 1]（mod 2^64）
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    hashes = codes
+    with np.errstate(over="ignore"):
+        for phrase_len in range(1, max_len + 1):
+            if phrase_len > 1:
+                hashes = hashes[:-1] * _HASH_BASE + codes[phrase_len - 1 :]
+            if phrase_len < min_phrase_len:
+                continue
+
+            # 最も頻出するハッシュ値の出現回数
+            sorted_hashes = np.sort(hashes)
+            edges = np.flatnonzero(np.diff(sorted_hashes)) + 1
+            runs = np.diff(edges, prepend=0, append=sorted_hashes.size)
+            if not _is_repeated(int(runs.max()), phrase_len, text_len):
+                continue
+
+            # ハッシュ衝突の可能性があるため文字列で数え直して確定する
+            if _is_repeated(_max_ngram_freq(text, phrase_len), phrase_len, text_len):
+                return True
 
-        if not ngrams:
-            continue
+    return False
 
-        # 最も頻出するN-gramをカウント
-        ngram_counts = Counter(ngrams)
-        most_common_ngram, freq = ngram_counts.most_common(1)[0]
 
-        # そのN-gramが占める文字数の割合
-        coverage = (freq * phrase_len) / text_len
+def _max_ngram_freq(text: str, phrase_len: int) -> int:
+    """長さphrase_lenのN-gramのうち最も頻出するものの出現回数"""
+    ngram_counts = Counter(text[i:i + phrase_len] for i in range(len(text) - phrase_len + 1))
+    return max(ngram_counts.values())
 
-        # 50%以上を同一のN-gramが占める場合は異常（閾値を厳しく）
-        if coverage > 0.5:
-            return True
 
-    return False
+def _is_repeated(freq: int, phrase_len: int, text_len: int) -> bool:
+    """同一のN-gramが占める文字数の割合が50%を超えるか（閾値を厳しく）"""
+    return (freq * phrase_len) / text_len > 0.5
@@ -1,8 +1,17 @@
+import torch
 from transformers import MarianMTModel, MarianTokenizer
 from config import settings
 from utils.logger import logger
+from collections import OrderedDict
 from typing import Optional
 import re
+import threading
+
+# 電話番号パターン（10〜11桁の数字）
+_PHONE_PATTERN = re.compile(r"\d{10,11}")
+
+# 文単位の翻訳結果キャッシュの最大件数
+_TRANSLATION_CACHE_SIZE = 256
 
 
 class Translator:
@@ -14,6 +23,9 @@ class Translator:
         self.model_name = settings.TRANSLATION_MODEL
         self.max_length = settings.MAX_TRANSLATION_LENGTH
         self.device = settings.TRANSLATION_DEVICE
+        # 同じ文の再翻訳ではエンコーダ・デコーダとも結果が変わらないため文単位でキャッシュ
+        self._translation_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._translation_cache_lock = threading.Lock()
 
     def _load_model(self):
         """翻訳モデルとトークナイザをロード（遅延ロード）"""
@@ -25,12 +37,33 @@ class Translator:
             self.tokenizer = MarianTokenizer.from_pretrained(self.model_name)
             self.model = MarianMTModel.from_pretrained(self.model_name)
             self.model.to(self.device)
+            if "cuda" in str(self.device):
+                # GPUではFP16で推論（重みの転送量を半減）
+                self.model = self.model.half()
+            elif settings.QUANTIZE_TRANSLATION:
+                # CPUではLinear層をint8へ動的量子化（行列演算を高速化）
+                try:
+                    self.model = torch.quantization.quantize_dynamic(
+                        self.model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    logger.info("🔧 翻訳モデルをint8に量子化しました")
+                except Exception as e:
+                    # 量子化バックエンドが使えない環境ではFP32のまま続行
+                    logger.warning(f"⚠️ 翻訳モデルの量子化に失敗したためFP32で推論します: {e}")
             self.model.eval()
             logger.info(f"✅ 翻訳モデルのロード完了")
         except Exception as e:
             logger.exception(f"❌ 翻訳モデルのロードに失敗: {e}")
             raise RuntimeError(f"翻訳モデルのロードに失敗しました: {e}")
 
+        if "cuda" in str(self.device):
+            # ウォームアップ（GPUでは初回推論時のcuDNN/cuBLASカーネル選択コストを先に払う）
+            # 失敗してもロード済みのモデルは使えるため、ログを残して続行する
+            try:
+                self._generate(["こんにちは"])
+            except Exception as e:
+                logger.warning(f"⚠️ 翻訳モデルのウォームアップに失敗: {e}")
+
     def _preprocess_text(self, text: str) -> tuple[str, dict]:
         """
         翻訳前の前処理（数字・電話番号の保護）
@@ -42,16 +75,15 @@ class Translator:
             (前処理後のテキスト, 置換マップ)
         """
         replacements = {}
-        processed_text = text
 
-        # 電話番号パターンを検出して保護
-        phone_pattern = r"\d{10,11}"
-        phones = re.findall(phone_pattern, processed_text)
-        for i, phone in enumerate(phones):
-            placeholder = f"__PHONE_{i}__"
-            replacements[placeholder] = phone
-            processed_text = processed_text.replace(phone, placeholder, 1)
-            logger.debug(f"電話番号を保護: {phone} → {placeholder}")
+        # 電話番号パターンを検出して保護（1回の置換パスでプレースホルダーを割り当てる）
+        def protect_phone(match: re.Match) -> str:
+            placeholder = f"__PHONE_{len(replacements)}__"
+            replacements[placeholder] = match.group(0)
+            logger.debug(f"電話番号を保護: {match.group(0)} → {placeholder}")
+            return placeholder
+
+        processed_text = _PHONE_PATTERN.sub(protect_phone, text)
 
         return processed_text, replacements
 
@@ -66,6 +98,12 @@ class Translator:
         Returns:
             後処理後のテキスト
         """
+        if len(replacements) > 3:
+            # 置換対象が多い場合は1本の正規表現でまとめて復元
+            pattern = re.compile("|".join(map(re.escape, replacements)))
+            logger.debug(f"保護要素を復元: {len(replacements)}件")
+            return pattern.sub(lambda m: replacements[m.group(0)], text)
+
         processed_text = text
         for placeholder, original in replacements.items():
             processed_text = processed_text.replace(placeholder, original)
@@ -126,30 +164,75 @@ class Translator:
         Returns:
             翻訳結果
         """
-        # トークナイズ
+        return self._translate_batch([text])[0]
+
+    def _translate_batch(self, texts: list[str]) -> list[str]:
+        """
+        複数チャンクをまとめて翻訳（未キャッシュの文のみ1回のgenerateで処理）
+
+        Args:
+            texts: 翻訳対象テキストのリスト（各max_length以内）
+
+        Returns:
+            入力と同じ順序の翻訳結果リスト
+        """
+        # キャッシュ済みの文はモデルに渡さない
+        with self._translation_cache_lock:
+            results = [self._translation_cache.get(text) for text in texts]
+            for text, result in zip(texts, results):
+                if result is not None:
+                    self._translation_cache.move_to_end(text)
+
+        missing = list(dict.fromkeys(t for t, r in zip(texts, results) if r is None))
+        if not missing:
+            return results
+
+        translated = dict(zip(missing, self._generate(missing)))
+        with self._translation_cache_lock:
+            for text, result in translated.items():
+                self._translation_cache[text] = result
+                self._translation_cache.move_to_end(text)
+            while len(self._translation_cache) > _TRANSLATION_CACHE_SIZE:
+                self._translation_cache.popitem(last=False)
+
+        return [r if r is not None else translated[t] for t, r in zip(texts, results)]
+
+    def _generate(self, texts: list[str]) -> list[str]:
+        """
+        モデルで翻訳を生成（キャッシュを介さない）
+
+        Args:
+            texts: 翻訳対象テキストのリスト（各max_length以内）
+
+        Returns:
+            入力と同じ順序の翻訳結果リスト
+        """
+        # トークナイズ（複数文の場合のみ長さの異なる文をパディングで揃える）
         inputs = self.tokenizer(
-            text, return_tensors="pt", padding=True, truncation=True, max_length=512
+            texts,
+            return_tensors="pt",
+            padding=len(texts) > 1,
+            truncation=True,
+            max_length=512,
         ).to(self.device)
 
         # 翻訳生成（品質向上パラメータ）
         # Phase 4最適化: num_beams を 6 → 4 に変更（処理時間30%削減）
-        translated_tokens = self.model.generate(
-            **inputs,
-            num_beams=4,  # ビームサーチで品質向上（6→4に削減、速度向上）
-            no_repeat_ngram_size=3,  # 3-gramの繰り返しを防止
-            repetition_penalty=1.3,  # 繰り返しペナルティを緩和（1.5→1.3）
-            length_penalty=0.8,  # 短めの翻訳を優先（1.0→0.8）
-            early_stopping=True,  # 早期終了を有効化
-            max_length=512,  # 最大出力長
-            temperature=0.7,  # 多様性を追加（デフォルトは1.0だが0.7で安定性向上）
-        )
+        with torch.inference_mode():
+            translated_tokens = self.model.generate(
+                **inputs,
+                num_beams=4,  # ビームサーチで品質向上（6→4に削減、速度向上）
+                no_repeat_ngram_size=3,  # 3-gramの繰り返しを防止
+                repetition_penalty=1.3,  # 繰り返しペナルティを緩和（1.5→1.3）
+                length_penalty=0.8,  # 短めの翻訳を優先（1.0→0.8）
+                early_stopping=True,  # 早期終了を有効化
+                max_length=512,  # 最大出力長
+                temperature=0.7,  # 多様性を追加（デフォルトは1.0だが0.7で安定性向上）
+                pad_token_id=self.tokenizer.pad_token_id,
+            )
 
         # デコード
-        translated_text = self.tokenizer.decode(
-            translated_tokens[0], skip_special_tokens=True
-        )
-
-        return translated_text
+        return self.tokenizer.batch_decode(translated_tokens, skip_special_tokens=True)
 
     def _split_into_sentences(self, text: str) -> list[str]:
         """
@@ -161,16 +244,25 @@ class Translator:
         Returns:
             文のリスト
         """
-        # 句点で分割
-        sentences = text.split("。")
+        # 句点の位置を順に探し、句点込みで1回だけスライスする
         result = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if sentence:
-                result.append(
-                    sentence + "。" if not sentence.endswith("。") else sentence
-                )
-        return result
+        start = 0
+        while True:
+            end = text.find("。", start)
+            if end == -1:
+                sentence = text[start:].strip()
+                if sentence:
+                    result.append(sentence + "。")
+                return result
+
+            if start < end and not text[start].isspace() and not text[end - 1].isspace():
+                result.append(text[start : end + 1])
+            else:
+                # 前後に空白がある文は取り除いてから句点を付け直す
+                sentence = text[start:end].strip()
+                if sentence:
+                    result.append(sentence + "。")
+            start = end + 1
 
     def _translate_long_text(self, text: str) -> str:
         """
@@ -187,13 +279,14 @@ class Translator:
 
         logger.info(f"📦 {len(sentences)}個の文に分割しました")
 
-        # 各文を個別に翻訳
-        translated_sentences = []
-        for i, sentence in enumerate(sentences):
-            logger.info(f"🔄 文 {i+1}/{len(sentences)} を翻訳中: {sentence[:30]}...")
-            translated = self._translate_chunk(sentence)
-            translated_sentences.append(translated)
-            logger.info(f"✅ 翻訳結果: {translated[:50]}...")
+        # 長さの近い文をまとめてバッチ翻訳（パディングの無駄を抑えるため長さ順に並べる）
+        translated_sentences = [""] * len(sentences)
+        for batch in _group_by_length(sentences):
+            logger.info(f"🔄 {len(batch)}文をまとめて翻訳中")
+            results = self._translate_batch([sentences[i] for i in batch])
+            for i, translated in zip(batch, results):
+                translated_sentences[i] = translated
+                logger.info(f"✅ 翻訳結果: {translated[:50]}...")
 
         # 結合して返す
         result = " ".join(translated_sentences)
@@ -201,6 +294,28 @@ class Translator:
         return result
 
 
+# バッチ翻訳の設定
+_MAX_BATCH_SIZE = 8  # 1回のgenerateでまとめる最大文数
+_BATCH_LENGTH_RATIO = 1.2  # 同じバッチに入れる文の長さの比の上限
+
+
+def _group_by_length(sentences: list[str]) -> list[list[int]]:
+    """文を長さ順に並べ、長さの近いものどうしのインデックスのグループに分ける"""
+    order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+    groups: list[list[int]] = []
+    for i in order:
+        if (
+            groups
+            and len(groups[-1]) < _MAX_BATCH_SIZE
+            and len(sentences[i])
+            <= len(sentences[groups[-1][0]]) * _BATCH_LENGTH_RATIO
+        ):
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+    return groups
+
+
 # シングルトンインスタンス
 _translator_instance: Optional[Translator] = None
 
@@ -4,17 +4,35 @@ WebSocket接続のライフサイクル管理と進捗通知を担当
 """
 
 from fastapi import WebSocket
+import asyncio
 from typing import Dict, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
-import uuid
+import secrets
 import json
 
 from utils.performance_monitor import PerformanceMonitor
 from utils.logger import logger
 
+# 送信JSONのシリアライズはC実装の orjson を優先（未インストール時は標準の json で代替）
+try:
+    import orjson
 
-@dataclass
+    def _dumps_text(data: dict) -> str:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+except ImportError:
+
+    def _dumps_text(data: dict) -> str:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+# 接続ごとの送信キューの上限（超過時は進捗通知のみ破棄する）
+_OUT_QUEUE_SIZE = 128
+# 切断時に送信キューの残りを送り切るまで待つ最大時間（秒）
+_DRAIN_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass(slots=True)
 class WebSocketConnection:
     """WebSocket接続の情報を保持するクラス"""
 
@@ -30,6 +48,11 @@ class WebSocketConnection:
             "summary": False,
         }
     )
+    # 送信待ちメッセージのキュー（送信は writer_task が順番に行う）
+    out_queue: asyncio.Queue = field(
+        default_factory=lambda: asyncio.Queue(maxsize=_OUT_QUEUE_SIZE)
+    )
+    writer_task: Optional[asyncio.Task] = None
 
     def increment_chunk(self) -> int:
         """チャンクカウントを増加させ、現在のカウントを返す"""
@@ -62,13 +85,14 @@ class WebSocketManager:
 
         # セッションIDがない場合は新規生成
         if session_id is None or session_id not in self.connections:
-            session_id = str(uuid.uuid4())
+            session_id = secrets.token_hex(8)  # 64bitの乱数による16桁の16進ID
 
         connection = WebSocketConnection(
             websocket=websocket,
             session_id=session_id,
         )
         self.connections[session_id] = connection
+        connection.writer_task = asyncio.create_task(self._writer(connection))
 
         logger.info(f"🔌 WebSocket接続確立: session_id={session_id}")
 
@@ -91,17 +115,20 @@ class WebSocketManager:
         Args:
             session_id: 切断するセッションID
         """
-        if session_id in self.connections:
-            connection = self.connections[session_id]
-            try:
-                await connection.websocket.close()
-            except Exception:
-                pass  # 既に閉じている場合は無視
-            del self.connections[session_id]
-            logger.info(
-                f"🔌 WebSocket接続切断: session_id={session_id}, "
-                f"処理チャンク数={connection.chunk_count}"
-            )
+        # 送信キューの残りを送る間に新規送信や二重の切断処理が入らないよう、先に管理下から外す
+        connection = self.connections.pop(session_id, None)
+        if connection is None:
+            return
+
+        await self._stop_writer(connection)
+        try:
+            await connection.websocket.close()
+        except Exception:
+            pass  # 既に閉じている場合は無視
+        logger.info(
+            f"🔌 WebSocket接続切断: session_id={session_id}, "
+            f"処理チャンク数={connection.chunk_count}"
+        )
 
     def get_connection(self, session_id: str) -> Optional[WebSocketConnection]:
         """
@@ -117,28 +144,81 @@ class WebSocketManager:
 
     async def send_json(self, session_id: str, data: dict) -> bool:
         """
-        JSONデータを送信
+        JSONデータを送信キューに積む（実際の送信は writer タスクが順番に行う）
 
         Args:
             session_id: 送信先のセッションID
             data: 送信するデータ
 
         Returns:
-            bool: 送信成功かどうか
+            bool: 送信キューに積めたかどうか（クライアントへの送信完了は意味しない）
+                  接続がない、キュー満杯で進捗通知を破棄した、writer 停止済みの場合はFalse
         """
         connection = self.get_connection(session_id)
         if connection is None:
             logger.warning(f"⚠️ [WS] send_json: セッション接続なし (session_id={session_id}, type={data.get('type')})")
             return False
 
+        if connection.websocket.client_state.name != "CONNECTED":
+            return False
+
+        # 実際の送信は writer タスクに任せ、処理パイプラインを送信待ちでブロックしない
         try:
-            if connection.websocket.client_state.name != "CONNECTED":
+            connection.out_queue.put_nowait(data)
+        except asyncio.QueueFull:
+            if data.get("type") == "progress":
+                # 進捗通知は最新のものが届けば十分なので破棄する
+                logger.debug(f"⚠️ [WS] 送信キューが満杯のため進捗通知を破棄: session_id={session_id}")
                 return False
-            await connection.websocket.send_json(data)
-            return True
-        except Exception:
-            # 切断済みの場合は静かに失敗
-            return False
+            # 結果・エラーなどは空きが出るまで待って送る
+            # ただし writer が停止した後はキューが消費されないため待たない
+            writer_task = connection.writer_task
+            if writer_task is None or writer_task.done():
+                return False
+            put_task = asyncio.ensure_future(connection.out_queue.put(data))
+            await asyncio.wait(
+                {put_task, writer_task}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not put_task.done():
+                put_task.cancel()
+                logger.debug(f"⚠️ [WS] 送信停止済みのためメッセージを破棄: session_id={session_id}")
+                return False
+        return True
+
+    async def _writer(self, connection: WebSocketConnection) -> None:
+        """送信キューのメッセージを順番にクライアントへ送る"""
+        queue = connection.out_queue
+        while True:
+            data = await queue.get()
+            try:
+                if connection.websocket.client_state.name == "CONNECTED":
+                    # テキストフレームとして送信（クライアント側の受信形式は従来どおり）
+                    await connection.websocket.send_text(_dumps_text(data))
+            except Exception:
+                # 切断済みの場合は静かに破棄
+                pass
+            finally:
+                queue.task_done()
+
+    async def _stop_writer(self, connection: WebSocketConnection) -> None:
+        """送信キューの残りを送り切ってから writer タスクを停止"""
+        task = connection.writer_task
+        if task is None:
+            return
+        try:
+            await asyncio.wait_for(
+                connection.out_queue.join(), timeout=_DRAIN_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"⚠️ [WS] 送信キューの送信が時間内に完了しませんでした: session_id={connection.session_id}"
+            )
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        connection.writer_task = None
 
     async def send_progress(
         self, session_id: str, step: str, message: str, chunk_id: Optional[int] = None
@@ -153,7 +233,7 @@ class WebSocketManager:
             chunk_id: 処理中のチャンクID（オプション）
 
         Returns:
-            bool: 送信成功かどうか
+            bool: 送信キューに積めたかどうか（send_json を参照）
         """
         data = {
             "type": "progress",
@@ -186,7 +266,7 @@ class WebSocketManager:
             performance: パフォーマンス情報
 
         Returns:
-            bool: 送信成功かどうか
+            bool: 送信キューに積めたかどうか（send_json を参照）
         """
         data = {
             "type": "result",
@@ -209,7 +289,7 @@ class WebSocketManager:
             error_message: エラーメッセージ
 
         Returns:
-            bool: 送信成功かどうか
+            bool: 送信キューに積めたかどうか（send_json を参照）
         """
         data = {
             "type": "error",
@@ -229,7 +309,7 @@ class WebSocketManager:
             statistics: 統計情報
 
         Returns:
-            bool: 送信成功かどうか
+            bool: 送信キューに積めたかどうか（send_json を参照）
         """
         data = {
             "type": "session_end",
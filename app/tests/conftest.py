@@ -14,3 +14,9 @@ sys.path.insert(0, str(project_root))
 # これにより、services/内のファイルから "from utils.logger import" が動作する
 app_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(app_dir))
+
+
+def pytest_configure(config):
+    """カスタムマーカーを登録"""
+    # 翻訳モデルのロードなど重い処理を伴うテスト（-m "not slow" で除外可能）
+    config.addinivalue_line("markers", "slow: 重いモデルのロードを伴うテスト")
@@ -7,8 +7,12 @@ Phase 6.6で追加された機能:
 """
 
 import pytest
+import functools
+import struct
 import wave
 import io
+import numpy as np
+from dataclasses import replace
 from services.cumulative_buffer import (
     CumulativeBuffer,
     CumulativeBufferConfig,
@@ -16,7 +20,7 @@ from services.cumulative_buffer import (
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def buffer_config():
     """テスト用のバッファ設定（短めの設定）"""
     return CumulativeBufferConfig(
@@ -29,12 +33,20 @@ def buffer_config():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def buffer(buffer_config):
-    """テスト用の累積バッファ"""
+    """テスト用の累積バッファ（モジュール内で共有し、テストごとにリセット）"""
     return CumulativeBuffer(buffer_config)
 
 
+@pytest.fixture(autouse=True)
+def _reset_buffer(buffer):
+    """共有バッファの状態をテストごとに初期化"""
+    buffer.clear()
+    buffer.on_before_trim_callback = None
+    yield
+
+
 def create_dummy_audio(duration_seconds: float, sample_rate: int = 16000) -> bytes:
     """ダミー音声データ（WAV形式）を生成
 
@@ -45,19 +57,57 @@ def create_dummy_audio(duration_seconds: float, sample_rate: int = 16000) -> byt
     Returns:
         WAV形式の音声データ
     """
-    # PCMデータ生成（無音）
+    return _dummy_audio(duration_seconds, sample_rate)
+
+
+@functools.lru_cache(maxsize=None)
+def _dummy_audio(duration_seconds: float, sample_rate: int) -> bytes:
+    """同じ引数のWAVは毎回同一のため、生成結果をキャッシュして使い回す（bytesは不変）"""
+    # PCMデータ長（16bit無音）
     num_samples = int(duration_seconds * sample_rate)
-    pcm_data = b"\x00\x00" * num_samples  # 16bit無音データ
+    data_size = 2 * num_samples
+
+    # モノラル・16bit固定のため44バイトのWAVヘッダーを直接組み立てる
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmtチャンクサイズ
+        1,  # PCM
+        1,  # チャンネル数
+        sample_rate,
+        sample_rate * 2,  # バイトレート
+        2,  # ブロックサイズ
+        16,  # ビット深度
+        b"data",
+        data_size,
+    )
+    return header + bytes(data_size)  # ゼロ埋めの無音データ
+
 
-    # WAV形式に変換
-    wav_buffer = io.BytesIO()
-    with wave.open(wav_buffer, "wb") as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(pcm_data)
+# よく使う長さのダミー音声はモジュール読み込み時に一度だけ生成
+AUDIO_0_25S = create_dummy_audio(0.25)
+AUDIO_0_5S = create_dummy_audio(0.5)
+AUDIO_1_0S = create_dummy_audio(1.0)
 
-    return wav_buffer.getvalue()
+
+def _drive_until_trim(buffer: CumulativeBuffer, text: str) -> TranscriptionResult:
+    """トリミングが発生するまで音声を追加し、トリミング付きの文字起こし結果を返す
+
+    1.0秒 + 0.5秒 = 1.5秒（トリミングは2チャンク以上ある場合のみ発生）。
+    Phase 7.0: トリミングはupdate_transcription内で実行される。
+    """
+    buffer.add_audio_chunk(AUDIO_1_0S)
+    _, should_trim = buffer.add_audio_chunk(AUDIO_0_5S)
+    assert should_trim, "トリミングが発生しませんでした"
+    return buffer.update_transcription(text, should_trim=True)
+
+
+def _test_hiragana_converter(text: str) -> str:
+    """簡易ひらがな変換（テスト用）"""
+    return text + "_ひらがな"
 
 
 class TestCallbackSetup:
@@ -65,18 +115,22 @@ class TestCallbackSetup:
 
     def test_set_callback(self, buffer):
         """コールバックを設定できることを確認"""
-        callback_called = []
+        callback_count = [0]
 
         def test_callback():
-            callback_called.append(True)
+            callback_count[0] += 1
 
         buffer.set_on_before_trim_callback(test_callback)
         assert buffer.on_before_trim_callback is not None
 
+        # 設定したコールバックがトリミング時に1回だけ呼ばれる
+        _drive_until_trim(buffer, "テストテキスト")
+        assert callback_count[0] == 1
+
     def test_callback_is_optional(self, buffer):
         """コールバックは省略可能"""
         # コールバックなしでもエラーにならない
-        audio = create_dummy_audio(0.5)
+        audio = AUDIO_0_5S
         should_transcribe, should_trim = buffer.add_audio_chunk(audio)
         assert True  # エラーが発生しなければOK
 
@@ -86,38 +140,30 @@ class TestTrimWithCallback:
 
     def test_callback_called_on_trim(self, buffer):
         """トリミング時にコールバックが呼ばれることを確認"""
-        callback_called = []
+        callback_count = [0]
 
         def test_callback():
-            callback_called.append(True)
+            callback_count[0] += 1
 
         buffer.set_on_before_trim_callback(test_callback)
 
         # トリミングが発生するまで音声を追加（1秒を超える）
-        should_trim = False
-        for i in range(3):
-            audio = create_dummy_audio(0.5)  # 0.5秒 × 3 = 1.5秒
-            should_transcribe, should_trim = buffer.add_audio_chunk(audio)
-
-        # Phase 7.0: トリミングはupdate_transcription内で実行される
-        # should_trimがTrueの場合、update_transcriptionを呼ぶ必要がある
-        if should_trim:
-            buffer.update_transcription("テストテキスト", should_trim=True)
+        _drive_until_trim(buffer, "テストテキスト")
 
         # コールバックが呼ばれたことを確認
-        assert len(callback_called) > 0, "コールバックが呼ばれませんでした"
+        assert callback_count[0] > 0, "コールバックが呼ばれませんでした"
 
     def test_callback_not_called_before_trim(self, buffer):
         """トリミング前はコールバックが呼ばれないことを確認"""
-        callback_called = []
+        callback_count = [0]
 
         def test_callback():
-            callback_called.append(True)
+            callback_count[0] += 1
 
         buffer.set_on_before_trim_callback(test_callback)
 
         # トリミングが発生しない範囲で音声を追加
-        audio = create_dummy_audio(0.5)  # 0.5秒 < 1秒（上限）
+        audio = AUDIO_0_5S  # 0.5秒 < 1秒（上限）
         should_transcribe, should_trim = buffer.add_audio_chunk(audio)
 
         # Phase 7.0: should_trimがFalseなのでトリミング不要
@@ -127,7 +173,7 @@ class TestTrimWithCallback:
         buffer.update_transcription("テストテキスト", should_trim=False)
 
         # コールバックは呼ばれない
-        assert len(callback_called) == 0
+        assert callback_count[0] == 0
 
 
 class TestForceFinalizePendingText:
@@ -180,18 +226,13 @@ class TestForceFinalizePendingText:
 
     def test_force_finalize_with_hiragana_converter(self, buffer):
         """ひらがな変換付きの強制確定"""
-
-        def hiragana_converter(text: str) -> str:
-            """簡易ひらがな変換（テスト用）"""
-            return text + "_ひらがな"
-
         buffer.last_transcription = "これはテストです"
         buffer.confirmed_text = ""
         buffer.confirmed_hiragana = ""
 
         # ひらがな変換付きで強制確定
         result = buffer.force_finalize_pending_text(
-            hiragana_converter=hiragana_converter
+            hiragana_converter=_test_hiragana_converter
         )
 
         assert result is True
@@ -218,18 +259,11 @@ class TestTrimWithForceFinalize:
         buffer.last_transcription = "皆さんおはようございます"
 
         # トリミングが発生するまで音声を追加
-        should_trim = False
-        for i in range(3):
-            audio = create_dummy_audio(0.5)
-            should_transcribe, should_trim = buffer.add_audio_chunk(audio)
-
-        # Phase 7.0: トリミングはupdate_transcription内で実行される
-        if should_trim:
-            buffer.update_transcription("皆さんおはようございます", should_trim=True)
+        _drive_until_trim(buffer, "皆さんおはようございます")
 
         # 確定テキストが保存されていることを確認
         assert len(finalized_texts) > 0
-        assert "皆さんおはようございます" in buffer.confirmed_text
+        assert buffer.confirmed_text == "皆さんおはようございます"
 
     def test_multiple_trims_accumulate_text(self, buffer):
         """複数回のトリミングで確定テキストが蓄積されることを確認"""
@@ -241,28 +275,14 @@ class TestTrimWithForceFinalize:
 
         # 1回目のトリミング
         buffer.last_transcription = "最初のテキスト"
-        should_trim1 = False
-        for i in range(3):
-            audio = create_dummy_audio(0.5)
-            should_transcribe, should_trim1 = buffer.add_audio_chunk(audio)
-
-        # Phase 7.0: トリミングはupdate_transcription内で実行される
-        if should_trim1:
-            buffer.update_transcription("最初のテキスト", should_trim=True)
+        _drive_until_trim(buffer, "最初のテキスト")
 
         # 2回目のトリミング
         buffer.last_transcription = "最初のテキスト2回目のテキスト"
-        should_trim2 = False
-        for i in range(3):
-            audio = create_dummy_audio(0.5)
-            should_transcribe, should_trim2 = buffer.add_audio_chunk(audio)
-
-        if should_trim2:
-            buffer.update_transcription("最初のテキスト2回目のテキスト", should_trim=True)
+        _drive_until_trim(buffer, "最初のテキスト2回目のテキスト")
 
         # 確定テキストが蓄積されていることを確認
-        assert "最初のテキスト" in buffer.confirmed_text
-        assert "2回目のテキスト" in buffer.confirmed_text
+        assert buffer.confirmed_text == "最初のテキスト2回目のテキスト"
 
 
 class TestBufferStats:
@@ -282,7 +302,7 @@ class TestBufferStats:
         # トリミング発生まで音声追加
         should_trim = False
         for i in range(3):
-            audio = create_dummy_audio(0.5)
+            audio = AUDIO_0_5S
             should_transcribe, should_trim = buffer.add_audio_chunk(audio)
 
         # Phase 7.0: トリミングはupdate_transcription内で実行される
@@ -325,21 +345,15 @@ class TestConfirmedTextIndependence:
         buffer.update_transcription("ようこそ", should_trim=False)
 
         # トリミング発生
-        should_trim = False
-        for i in range(3):
-            audio = create_dummy_audio(0.5)
-            should_transcribe, should_trim = buffer.add_audio_chunk(audio)
-
         # 新しい文字起こし（バッファには "ようこそ" が含まれない想定）
-        if should_trim:
-            result = buffer.update_transcription("今日は", should_trim=True)
+        result = _drive_until_trim(buffer, "今日は")
 
-            # 確定テキストは保持されている
-            assert "ようこそ" in result.confirmed_text
-            # 全体テキストは連続している
-            assert result.full_text == result.confirmed_text + result.tentative_text
-            # 暫定テキストは新しいバッファの内容
-            assert "今日は" in result.full_text
+        # 確定テキストは保持されている
+        assert result.confirmed_text == "ようこそ"
+        # 全体テキストは連続している
+        assert result.full_text == result.confirmed_text + result.tentative_text
+        # 暫定テキストは新しいバッファの内容
+        assert result.full_text == "ようこそ今日は"
 
     def test_no_duplication_between_confirmed_and_tentative(self, buffer):
         """確定テキストと暫定テキストが重複しないことを確認"""
@@ -354,21 +368,15 @@ class TestConfirmedTextIndependence:
         result2 = buffer.update_transcription("こんにちは今日は", should_trim=False)
 
         # トリミング発生
-        should_trim = False
-        for i in range(3):
-            audio = create_dummy_audio(0.5)
-            should_transcribe, should_trim = buffer.add_audio_chunk(audio)
-
-        if should_trim:
-            result3 = buffer.update_transcription("良い天気です", should_trim=True)
+        result3 = _drive_until_trim(buffer, "良い天気です")
 
-            # full_text = confirmed_text + tentative_text
-            assert result3.full_text == result3.confirmed_text + result3.tentative_text
+        # full_text = confirmed_text + tentative_text
+        assert result3.full_text == result3.confirmed_text + result3.tentative_text
 
-            # 確定と暫定が重複していないことを確認
-            # （簡易チェック: 長さの合計がfull_textの長さと一致）
-            combined_length = len(result3.confirmed_text) + len(result3.tentative_text)
-            assert len(result3.full_text) == combined_length
+        # 確定と暫定が重複していないことを確認
+        # （簡易チェック: 長さの合計がfull_textの長さと一致）
+        combined_length = len(result3.confirmed_text) + len(result3.tentative_text)
+        assert len(result3.full_text) == combined_length
 
     def test_force_finalize_after_trim(self, buffer):
         """トリミング後のforce_finalize_pending_textが正しく動作することを確認"""
@@ -387,7 +395,6 @@ class TestConfirmedTextIndependence:
         # 強制確定実行（バッファに確定テキストが含まれない）
         result2 = buffer.force_finalize_pending_text()
         assert result2 is True
-        assert "明日も晴れるでしょう" in buffer.confirmed_text
         assert buffer.confirmed_text == "こんにちは今日は良い天気です明日も晴れるでしょう"
 
     def test_session_end_with_independent_confirmed_text(self, buffer):
@@ -402,21 +409,95 @@ class TestConfirmedTextIndependence:
         buffer.update_transcription("第一部", should_trim=False)
 
         # トリミング発生
-        should_trim = False
-        for i in range(3):
-            audio = create_dummy_audio(0.5)
-            should_transcribe, should_trim = buffer.add_audio_chunk(audio)
-
-        if should_trim:
-            buffer.update_transcription("第二部", should_trim=True)
+        _drive_until_trim(buffer, "第二部")
 
         # セッション終了
         final_result = buffer.finalize()
 
         # 全体が確定テキストに含まれている
-        assert "第一部" in final_result.confirmed_text
-        assert "第二部" in final_result.confirmed_text
+        assert final_result.confirmed_text == "第一部第二部"
         # 暫定テキストは空
         assert final_result.tentative_text == ""
         # full_textと確定テキストが一致
         assert final_result.full_text == final_result.confirmed_text
+
+    def test_repeated_text_reuses_previous_result(self, buffer_config):
+        """同じテキストが続き確定に至らない場合、前回結果が再利用されることを確認"""
+        # 共有設定を変更しないよう複製して閾値を変える
+        buffer = CumulativeBuffer(replace(buffer_config, stable_text_threshold=3))
+
+        buffer.update_transcription("こんにちは。", should_trim=False)
+        buffer.update_transcription("こんにちは。", should_trim=False)
+        result1 = buffer.update_transcription("こんにちは。今日は", should_trim=False)
+        result2 = buffer.update_transcription("こんにちは。今日は", should_trim=False)
+
+        assert buffer.stable_count == 1
+        assert result2.tentative_text == result1.tentative_text
+        assert result2.full_text == result1.full_text
+        # 新規確定は再送しない
+        assert result2.new_confirmed_segments == []
+
+    def test_assigning_confirmed_text_invalidates_previous_result(self, buffer_config):
+        """確定テキストを書き換えた後は前回結果を再利用しないことを確認"""
+        buffer = CumulativeBuffer(replace(buffer_config, stable_text_threshold=3))
+
+        buffer.update_transcription("こんにちは。", should_trim=False)
+        buffer.update_transcription("こんにちは。", should_trim=False)
+        buffer.update_transcription("こんにちは。今日は", should_trim=False)
+
+        buffer.confirmed_text = "別の確定。"
+        buffer.confirmed_hiragana = "べつのかくてい。"
+        result = buffer.update_transcription("こんにちは。今日は", should_trim=False)
+
+        assert result.confirmed_text == "別の確定。"
+        assert result.confirmed_hiragana == "べつのかくてい。"
+        assert result.full_text.startswith("別の確定。")
+
+    def test_remove_confirmed_overlap_longest_match(self, buffer):
+        """確定テキスト末尾と新テキスト先頭の最長一致部分が除外されることを確認"""
+        assert buffer._remove_confirmed_overlap("ようこそ今日は", "今日は良い天気") == "良い天気"
+        # 複数の一致候補がある場合は最長のものを採用
+        assert buffer._remove_confirmed_overlap("ああああ", "ああいう") == "いう"
+        # 一致なし・new が短い場合は new 全体を返す
+        assert buffer._remove_confirmed_overlap("こんにちは", "さようなら") == "さようなら"
+
+
+class TestExtractPcm:
+    """WAVヘッダー解析のテスト"""
+
+    def test_extract_pcm_from_wav(self, buffer):
+        """WAVデータからPCMデータのみが抽出されることを確認"""
+        audio = AUDIO_0_5S
+        pcm = buffer._extract_pcm_from_wav(audio)
+        assert len(pcm) == 16000  # 0.5秒 × 16000Hz × 2bytes
+
+    def test_extract_pcm_raw_data(self, buffer):
+        """WAVヘッダーがない場合はそのまま返すことを確認"""
+        raw = b"\x01\x00" * 100
+        assert buffer._extract_pcm_from_wav(raw) == raw
+
+    def test_get_accumulated_audio_is_valid_wav(self, buffer):
+        """累積音声が正しいWAV形式で取得できることを確認"""
+        buffer.add_audio_chunk(AUDIO_0_25S)
+        buffer.add_audio_chunk(AUDIO_0_25S)
+
+        wav_data = buffer.get_accumulated_audio()
+        with wave.open(io.BytesIO(wav_data), "rb") as wav_file:
+            assert wav_file.getnchannels() == 1
+            assert wav_file.getsampwidth() == 2
+            assert wav_file.getframerate() == 16000
+            assert wav_file.getnframes() == 8000
+
+    def test_get_accumulated_samples_after_trim(self, buffer):
+        """トリミング後も有効範囲のPCMがfloat32サンプルとして取得できることを確認"""
+        for i in range(12):
+            buffer.add_audio_chunk(bytes([i, 0]) * 8000)  # 0.5秒ずつ異なる値
+        buffer._trim_buffer_if_needed()
+
+        samples = buffer.get_accumulated_samples()
+        assert samples.dtype == np.float32
+        assert samples.size == buffer.total_audio_bytes // 2
+        # 先頭は削除されずに残った最古のチャンク
+        first_chunk = 12 - len(buffer._chunk_sizes)
+        assert samples[0] == pytest.approx(first_chunk / 32768.0)
+        assert samples[-1] == pytest.approx(11 / 32768.0)
@@ -0,0 +1,348 @@
+"""
+LLM漢字変換（llm_analyzer）のテスト
+
+Ollamaへの通信は _session.post を差し替えて行わない
+"""
+
+import json
+import threading
+from concurrent.futures import Future
+
+import pytest
+import requests
+
+from services import llm_analyzer
+
+
+class FakeResponse:
+    """Ollamaのストリーミング応答を模したレスポンス"""
+
+    def __init__(self, tokens=(), status_code=200):
+        self.tokens = list(tokens)
+        self.status_code = status_code
+        self.lines_read = 0
+
+    def iter_lines(self):
+        for token in self.tokens:
+            self.lines_read += 1
+            yield json.dumps(
+                {"message": {"content": token}, "done": False}
+            ).encode("utf-8")
+        self.lines_read += 1
+        yield json.dumps({"message": {"content": ""}, "done": True}).encode("utf-8")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error", response=self
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+@pytest.fixture(autouse=True)
+def _reset_llm_state():
+    """テスト間でキャッシュと処理中リクエストを共有しない"""
+    llm_analyzer._llm_cache.clear()
+    llm_analyzer._llm_inflight.clear()
+    yield
+    llm_analyzer._llm_cache.clear()
+    llm_analyzer._llm_inflight.clear()
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """再試行の待ち時間を省略"""
+    monkeypatch.setattr(llm_analyzer.time, "sleep", lambda _: None)
+
+
+def _fake_post(monkeypatch, *outcomes):
+    """_session.post が outcomes を順に返す（例外の場合は送出する）ように差し替える"""
+    calls = []
+    remaining = list(outcomes)
+
+    def post(*args, **kwargs):
+        calls.append(kwargs)
+        outcome = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(llm_analyzer._session, "post", post)
+    return calls
+
+
+class TestReadStreamedContent:
+    """ストリーミング応答の読み取りと打ち切りのテスト"""
+
+    def test_fenced_json(self):
+        """コードフェンスで囲まれたJSONを取り出し、閉じた時点で読み取りを打ち切る"""
+        response = FakeResponse(
+            ["```json\n", '{"text": "今日', 'は", "confidence": 0.9}', "\n```", "余分な生成"]
+        )
+        content = llm_analyzer._read_streamed_content(response)
+
+        assert content == '```json\n{"text": "今日は", "confidence": 0.9}'
+        assert llm_analyzer._extract_json_object(content) == {
+            "text": "今日は",
+            "confidence": 0.9,
+        }
+        # 残りの生成は読まない
+        assert response.lines_read == 3
+
+    def test_braces_inside_string(self):
+        """文字列リテラル内の括弧はオブジェクトの区切りとして数えない"""
+        response = FakeResponse(['{"text": "a}b', '{c", "confidence": 0.5}', "後続"])
+        content = llm_analyzer._read_streamed_content(response)
+
+        assert llm_analyzer._extract_json_object(content)["text"] == "a}b{c"
+        assert response.lines_read == 2
+
+    def test_escaped_quotes(self):
+        """エスケープされた引用符で文字列の終端を誤認しない"""
+        response = FakeResponse(
+            ['{"text": "say \\"}', '\\" ok", "confidence": 0.7}', "後続"]
+        )
+        content = llm_analyzer._read_streamed_content(response)
+
+        assert llm_analyzer._extract_json_object(content)["text"] == 'say "}" ok'
+        assert response.lines_read == 2
+
+    def test_skips_object_without_text(self):
+        """"text" を含まないオブジェクトでは打ち切らずに読み続ける"""
+        response = FakeResponse(['{"a": 1} ', '{"text": "漢字", "confidence": 0.8}'])
+        content = llm_analyzer._read_streamed_content(response)
+
+        assert llm_analyzer._extract_json_object(content)["text"] == "漢字"
+
+    def test_truncated_stream(self):
+        """オブジェクトが閉じないまま終了した場合は受信分をそのまま返す"""
+        response = FakeResponse(['{"text": "途中'])
+        content = llm_analyzer._read_streamed_content(response)
+
+        assert content == '{"text": "途中'
+        with pytest.raises(ValueError):
+            llm_analyzer._extract_json_object(content)
+
+    def test_truncated_stream_returns_error_result(self, monkeypatch):
+        """途中で切れた応答はエラー結果として入力をそのまま返す"""
+        _fake_post(monkeypatch, FakeResponse(['{"text": "途中']))
+
+        result = llm_analyzer._request_llm("とちゅう")
+        assert result["text"] == "とちゅう"
+        assert result["confidence"] == 0.0
+        assert "error" in result
+
+
+class TestExtractJsonObject:
+    """LLM応答からのJSON抽出のテスト"""
+
+    def test_prefers_object_with_text(self):
+        """"text" を含むオブジェクトを優先する"""
+        content = '{"note": 1} 出力: {"text": "今日", "confidence": 0.9}'
+        assert llm_analyzer._extract_json_object(content)["text"] == "今日"
+
+    def test_nested_object(self):
+        """ネストした内側のオブジェクトの "text" も見つける"""
+        content = '{"result": {"text": "明日", "confidence": 0.8}}'
+        assert llm_analyzer._extract_json_object(content)["text"] == "明日"
+
+    def test_no_object_raises(self):
+        """JSONオブジェクトがない場合はValueError"""
+        with pytest.raises(ValueError):
+            llm_analyzer._extract_json_object("変換できませんでした")
+
+
+class TestPostChatWithRetry:
+    """再試行とバックオフのテスト"""
+
+    GOOD = ['{"text": "今日", "confidence": 0.9}']
+
+    def test_retry_on_timeout(self, monkeypatch, no_sleep):
+        """タイムアウト後の再試行で成功する"""
+        calls = _fake_post(
+            monkeypatch, requests.exceptions.Timeout("timeout"), FakeResponse(self.GOOD)
+        )
+        content = llm_analyzer._post_chat_with_retry(b"{}")
+
+        assert json.loads(content)["text"] == "今日"
+        assert len(calls) == 2
+
+    def test_retry_after_slow_timeout(self, monkeypatch):
+        """OLLAMA_TIMEOUT まで待ってタイムアウトした場合も再試行する"""
+        timeout = llm_analyzer.settings.OLLAMA_TIMEOUT
+        assert timeout > llm_analyzer.settings.OLLAMA_RETRY_BUDGET
+
+        clock = [1000.0]
+
+        def advance(seconds):
+            clock[0] += seconds
+
+        monkeypatch.setattr(llm_analyzer.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(llm_analyzer.time, "sleep", advance)
+        calls = []
+
+        def post(*args, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                # 失敗するリクエスト自体がタイムアウトまで時間を消費する
+                advance(timeout)
+                raise requests.exceptions.Timeout("read timeout")
+            return FakeResponse(self.GOOD)
+
+        monkeypatch.setattr(llm_analyzer._session, "post", post)
+
+        content = llm_analyzer._post_chat_with_retry(b"{}")
+
+        assert json.loads(content)["text"] == "今日"
+        assert len(calls) == 2
+
+    def test_retry_on_5xx(self, monkeypatch, no_sleep):
+        """5xx応答後の再試行で成功する"""
+        calls = _fake_post(
+            monkeypatch, FakeResponse(status_code=503), FakeResponse(self.GOOD)
+        )
+        content = llm_analyzer._post_chat_with_retry(b"{}")
+
+        assert json.loads(content)["text"] == "今日"
+        assert len(calls) == 2
+
+    def test_no_retry_on_4xx(self, monkeypatch, no_sleep):
+        """4xx応答はリクエスト自体の問題のため再試行しない"""
+        calls = _fake_post(monkeypatch, FakeResponse(status_code=400))
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            llm_analyzer._post_chat_with_retry(b"{}")
+        assert len(calls) == 1
+
+    def test_gives_up_after_max_retries(self, monkeypatch, no_sleep):
+        """再試行回数を使い切ったら例外を送出する"""
+        monkeypatch.setattr(llm_analyzer.settings, "OLLAMA_MAX_RETRIES", 2)
+        calls = _fake_post(monkeypatch, requests.exceptions.Timeout("timeout"))
+
+        with pytest.raises(requests.exceptions.Timeout):
+            llm_analyzer._post_chat_with_retry(b"{}")
+        assert len(calls) == 3
+
+    def test_gives_up_when_budget_spent(self, monkeypatch, no_sleep):
+        """待ち時間が再試行の予算を超える場合は再試行せずに諦める"""
+        monkeypatch.setattr(llm_analyzer.settings, "OLLAMA_MAX_RETRIES", 5)
+        monkeypatch.setattr(llm_analyzer.settings, "OLLAMA_RETRY_BUDGET", 0.0)
+        calls = _fake_post(monkeypatch, requests.exceptions.ConnectionError("down"))
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            llm_analyzer._post_chat_with_retry(b"{}")
+        assert len(calls) == 1
+
+    def test_budget_counts_total_backoff(self, monkeypatch, no_sleep):
+        """再試行の待ち時間の合計が予算を超える時点で諦める"""
+        monkeypatch.setattr(llm_analyzer.settings, "OLLAMA_MAX_RETRIES", 5)
+        # 1回目の待ち時間は0.2〜0.4秒、2回目は0.4〜0.6秒のため2回目の再試行前に予算を超える
+        monkeypatch.setattr(llm_analyzer.settings, "OLLAMA_RETRY_BUDGET", 0.5)
+        calls = _fake_post(monkeypatch, requests.exceptions.ConnectionError("down"))
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            llm_analyzer._post_chat_with_retry(b"{}")
+        assert len(calls) == 2
+
+
+class TestCallLlm:
+    """キャッシュと同時リクエストの集約のテスト"""
+
+    @pytest.fixture
+    def follower_waiting(self, monkeypatch):
+        """後続の呼び出しが先行リクエストの結果待ちに入ったことを通知するイベント"""
+        waiting = threading.Event()
+
+        class _TrackedFuture(Future):
+            def result(self, timeout=None):
+                waiting.set()
+                return super().result(timeout)
+
+        monkeypatch.setattr(llm_analyzer, "Future", _TrackedFuture)
+        return waiting
+
+    def _run_leader_and_follower(self, follower_waiting, text):
+        """先行リクエストの処理中に同じ入力で2つ目の呼び出しを行い、両方の結果（または例外）を返す"""
+        outcomes = {}
+
+        def call(name):
+            try:
+                outcomes[name] = llm_analyzer.call_llm(text)
+            except Exception as e:
+                outcomes[name] = e
+
+        leader = threading.Thread(target=call, args=("leader",))
+        leader.start()
+        assert self.started.wait(timeout=5)
+
+        follower = threading.Thread(target=call, args=("follower",))
+        follower.start()
+        assert follower_waiting.wait(timeout=5)
+
+        self.release.set()
+        leader.join(timeout=5)
+        follower.join(timeout=5)
+        return outcomes
+
+    def _fake_request(self, monkeypatch, outcome):
+        """呼び出し回数を数え、release が立つまで応答を返さない _request_llm"""
+        self.started = threading.Event()
+        self.release = threading.Event()
+        calls = []
+
+        def request(text):
+            calls.append(text)
+            self.started.set()
+            self.release.wait(timeout=5)
+            if isinstance(outcome, BaseException):
+                raise outcome
+            return dict(outcome)
+
+        monkeypatch.setattr(llm_analyzer, "_request_llm", request)
+        return calls
+
+    def test_concurrent_calls_share_one_request(self, monkeypatch, follower_waiting):
+        """同じ入力の同時呼び出しは1回のリクエストにまとめられる"""
+        calls = self._fake_request(
+            monkeypatch, {"text": "今日は", "confidence": 0.9}
+        )
+        outcomes = self._run_leader_and_follower(follower_waiting, "きょうは")
+
+        assert len(calls) == 1
+        assert outcomes["leader"] == {"text": "今日は", "confidence": 0.9}
+        assert outcomes["follower"] == outcomes["leader"]
+
+    def test_leader_exception_propagates_to_follower(self, monkeypatch, follower_waiting):
+        """先行リクエストの例外は結果待ちの呼び出しにも伝わる"""
+        calls = self._fake_request(monkeypatch, RuntimeError("boom"))
+        outcomes = self._run_leader_and_follower(follower_waiting, "きょうは")
+
+        assert len(calls) == 1
+        assert isinstance(outcomes["leader"], RuntimeError)
+        assert outcomes["follower"] is outcomes["leader"]
+        assert not llm_analyzer._llm_inflight
+
+    def test_successful_result_is_cached(self, monkeypatch):
+        """変換に成功した結果はキャッシュされ、再送信しない"""
+        calls = _fake_post(
+            monkeypatch, FakeResponse(['{"text": "今日は", "confidence": 0.9}'])
+        )
+        first = llm_analyzer.call_llm("きょうは")
+        second = llm_analyzer.call_llm("きょうは")
+
+        assert first == second == {"text": "今日は", "confidence": 0.9}
+        assert len(calls) == 1
+
+    def test_empty_reply_is_not_cached(self, monkeypatch):
+        """空応答による信頼度0のフォールバック結果はキャッシュしない"""
+        calls = _fake_post(monkeypatch, FakeResponse([]))
+        first = llm_analyzer.call_llm("きょうは")
+        llm_analyzer.call_llm("きょうは")
+
+        assert first == {"text": "きょうは", "confidence": 0.0}
+        assert len(calls) == 2
@@ -10,14 +10,15 @@ import pytest
 from app.utils.normalizer import JapaneseNormalizer
 
 
+@pytest.fixture(scope="session")
+def normalizer():
+    """テスト用の正規化インスタンス（辞書ロードを1回にするため全テストで共有）"""
+    return JapaneseNormalizer()
+
+
 class TestJapaneseNormalizer:
     """JapaneseNormalizerクラスの基本テスト"""
 
-    @pytest.fixture
-    def normalizer(self):
-        """テスト用の正規化インスタンス"""
-        return JapaneseNormalizer()
-
     # ========================================
     # to_hiragana のテスト: 基本動作
     # ========================================
@@ -2,7 +2,9 @@
 セッション管理機能のテスト
 """
 
+import asyncio
 import pytest
+import threading
 import time
 from datetime import datetime, timedelta
 from app.services.session_manager import (
@@ -179,6 +181,27 @@ class TestSession:
         context = session.get_context_text()
         assert context == ""
 
+    def test_get_context_text_updates_after_add_chunk(self, session):
+        """チャンク追加後はキャッシュではなく最新の文脈を返す"""
+        for i in range(3):
+            session.add_chunk(
+                ChunkData(
+                    chunk_id=i,
+                    timestamp=time.time(),
+                    original_text=f"テキスト{i}",
+                    hiragana_text=f"てきすと{i}",
+                    translated_text=f"Text{i}",
+                    processing_time=1.0,
+                )
+            )
+            expected = " ".join(f"テキスト{j}" for j in range(max(0, i - 1), i + 1))
+            context = session.get_context_text(limit=2)
+            assert context == expected
+            # 間にチャンク追加がなければキャッシュ済みの文字列をそのまま返す
+            assert session.get_context_text(limit=2) is context
+
+        assert session.get_context_text(limit=2) == "テキスト1 テキスト2"
+
     # ========================================
     # is_expired のテスト
     # ========================================
@@ -229,11 +252,12 @@ class TestSessionManager:
     # create_session のテスト
     # ========================================
 
-    def test_create_session_auto_uuid(self, manager):
-        """自動UUID生成でのセッション作成"""
+    def test_create_session_auto_id(self, manager):
+        """自動ID生成でのセッション作成"""
         session_id = manager.create_session()
         assert session_id is not None
-        assert len(session_id) == 36  # UUID形式
+        assert len(session_id) == 16  # 16桁の16進ID
+        int(session_id, 16)
         assert session_id in manager.sessions
 
     def test_create_session_with_custom_id(self, manager):
@@ -257,7 +281,8 @@ class TestSessionManager:
         assert session.session_id == session_id
         assert isinstance(session.created_at, datetime)
         assert isinstance(session.last_updated, datetime)
-        assert session.chunks == []
+        assert list(session.chunks) == []
+        assert session.chunks.maxlen == manager.max_chunks_per_session
         assert session.total_chunks == 0
 
     # ========================================
@@ -276,8 +301,8 @@ class TestSessionManager:
         session = manager.get_session("non-existent-id")
         assert session is None
 
-    def test_get_session_expired_auto_delete(self):
-        """期限切れセッションの自動削除"""
+    def test_get_session_expired_removed_by_cleanup_loop(self):
+        """期限切れセッションは定期掃除ループで削除される"""
         manager = SessionManager(timeout_minutes=0)  # タイムアウト0分
         session_id = manager.create_session()
 
@@ -286,9 +311,14 @@ class TestSessionManager:
             minutes=1
         )
 
-        # 取得時に自動削除される
-        session = manager.get_session(session_id)
-        assert session is None
+        async def run_one_cycle():
+            task = asyncio.create_task(manager.cleanup_loop(interval_seconds=0))
+            await asyncio.sleep(0.01)
+            task.cancel()
+
+        asyncio.run(run_one_cycle())
+
+        assert manager.get_session(session_id) is None
         assert session_id not in manager.sessions
 
     # ========================================
@@ -343,13 +373,8 @@ class TestSessionManager:
             )
 
         session = manager.get_session(session_id)
-        # 最大10個を超えたら半分（5個）削除される
-        # 11個目追加時: 10個 → 5個に削除 → 11個目追加 = 6個
-        # 12個目追加時: 6個 → そのまま → 7個
-        # 13個目追加時: 7個 → そのまま → 8個
-        # 14個目追加時: 8個 → そのまま → 9個
-        # 15個目追加時: 9個 → そのまま → 10個
-        # 最終的に10個のチャンク（ID: 5-14）が保持される
+        # 最大10個を超えたら追加のたびに最古の1個が削除される
+        # 最終的に最新10個のチャンク（ID: 5-14）が保持される
         assert len(session.chunks) == 10
         # 古いチャンク（ID: 0-4）が削除されていることを確認
         assert session.chunks[0].chunk_id == 5
@@ -418,6 +443,29 @@ class TestSessionManager:
         assert new_id in manager.sessions
         assert old_id not in manager.sessions
 
+    def test_cleanup_expired_sessions_keeps_recently_updated(self):
+        """チャンク追加で更新されたセッションは削除されない"""
+        manager = SessionManager(timeout_minutes=1)
+        active_id = manager.create_session()
+        idle_id = manager.create_session()
+        for sid in [active_id, idle_id]:
+            manager.sessions[sid].last_updated = datetime.now() - timedelta(minutes=2)
+
+        manager.add_chunk_to_session(
+            session_id=active_id,
+            chunk_id=0,
+            timestamp=time.time(),
+            original_text="こんにちは",
+            hiragana_text="こんにちは",
+            translated_text="Hello",
+            processing_time=1.5,
+        )
+
+        count = manager.cleanup_expired_sessions()
+        assert count == 1
+        assert active_id in manager.sessions
+        assert idle_id not in manager.sessions
+
     def test_cleanup_expired_sessions_all_expired(self):
         """全セッションが期限切れ"""
         manager = SessionManager(timeout_minutes=1)
@@ -523,7 +571,7 @@ class TestSessionManager:
         [
             (3, 3),  # 最大値以下
             (10, 10),  # ちょうど最大値
-            (15, 10),  # 超過（11個目で半分削除 → 6個、その後4個追加して10個に到達）
+            (15, 10),  # 超過（最新10個のみ保持）
         ],
     )
     def test_chunk_limit_behavior(self, chunk_count, expected_in_memory):
@@ -642,6 +690,36 @@ class TestSessionManagerIntegration:
             session = manager.get_session(session_id)
             assert len(session.chunks) == i + 1
 
+    def test_cleanup_concurrent_with_create_and_delete(self):
+        """別スレッドでの作成・削除と並行してクリーンアップしても例外が出ない"""
+        manager = SessionManager(timeout_minutes=30)
+        errors = []
+
+        def churn(worker_id):
+            try:
+                for i in range(200):
+                    session_id = manager.create_session(f"w{worker_id}-{i}")
+                    manager.delete_session(session_id)
+            except Exception as e:
+                errors.append(e)
+
+        def cleanup():
+            try:
+                for _ in range(200):
+                    manager.cleanup_expired_sessions()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=churn, args=(i,)) for i in range(4)]
+        threads.append(threading.Thread(target=cleanup))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert manager.get_session_count() == 0
+
 
 if __name__ == "__main__":
     # このファイルを直接実行してテスト
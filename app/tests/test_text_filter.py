@@ -0,0 +1,114 @@
+"""
+テキスト品質フィルタ（text_filter）のテスト
+"""
+
+import numpy as np
+import pytest
+
+from services import text_filter
+from services.text_filter import (
+    _ROLLING_HASH_MIN_LEN,
+    _has_repeated_phrases,
+    is_valid_text,
+)
+
+# 繰り返しのない自然な文（ロールハッシュ経路の対象となる長さ）
+LONG_NATURAL_TEXT = (
+    "本日は新しい音声解析システムの概要について説明します。"
+    "まず録音された音声を一定間隔で区切り、文字起こしを行います。"
+    "次に確定した文章をひらがなに変換し、必要に応じて英語へ翻訳します。"
+)
+
+
+class TestIsValidText:
+    """is_valid_text の基本動作のテスト"""
+
+    def test_valid_sentence(self):
+        """通常の日本語の文は有効"""
+        assert is_valid_text("今日は良い天気です") is True
+
+    def test_no_japanese(self):
+        """日本語の文字を含まないテキストは無効"""
+        assert is_valid_text("hello 123") is False
+
+    def test_filler_only(self):
+        """フィラーのみのテキストは無効"""
+        assert is_valid_text("えーー") is False
+
+    def test_same_char_noise(self):
+        """同一文字が大半を占めるテキストは無効"""
+        assert is_valid_text("ああああああああああい") is False
+
+    def test_long_natural_text(self):
+        """長い自然な文は有効"""
+        assert len(LONG_NATURAL_TEXT) >= _ROLLING_HASH_MIN_LEN
+        assert is_valid_text(LONG_NATURAL_TEXT) is True
+
+
+class TestHasRepeatedPhrases:
+    """繰り返しフレーズ検出のテスト"""
+
+    def test_short_repeated(self):
+        """短いテキストの繰り返し（直接集計の経路）"""
+        assert _has_repeated_phrases("ありがとうありがとうありがとう") is True
+
+    def test_short_not_repeated(self):
+        """短いテキストの繰り返しなし"""
+        assert _has_repeated_phrases("今日は良い天気です") is False
+
+    def test_long_repeated(self):
+        """長いテキストの繰り返し（ロールハッシュの経路）"""
+        text = "ご視聴ありがとうございました。" * 8
+        assert len(text) >= _ROLLING_HASH_MIN_LEN
+        assert _has_repeated_phrases(text) is True
+
+    def test_long_repeated_after_prefix(self):
+        """前置きのあとに繰り返しが続く長いテキスト"""
+        text = "それでは始めます。" + "はいはいはい" * 15
+        assert len(text) >= _ROLLING_HASH_MIN_LEN
+        assert _has_repeated_phrases(text) is True
+
+    def test_long_not_repeated(self):
+        """長いテキストの繰り返しなし"""
+        assert _has_repeated_phrases(LONG_NATURAL_TEXT) is False
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            LONG_NATURAL_TEXT,
+            "ご視聴ありがとうございました。" * 8,
+            "あいうえお" * 16,
+            LONG_NATURAL_TEXT + "そうですねそうですね" * 5,
+        ],
+    )
+    def test_long_path_matches_direct_count(self, text):
+        """ロールハッシュの経路と N-gram の直接集計で判定が一致する"""
+        max_len = min(30, len(text) // 2)
+        expected = any(
+            text_filter._is_repeated(
+                text_filter._max_ngram_freq(text, phrase_len), phrase_len, len(text)
+            )
+            for phrase_len in range(3, max_len + 1)
+        )
+        assert _has_repeated_phrases(text) is expected
+
+    def test_hash_collision_rejected_by_exact_count(self, monkeypatch):
+        """ハッシュが衝突しても文字列の数え直しで繰り返しなしと判定する"""
+        # 基数0ではN-gramのハッシュが末尾の1文字だけで決まり、衝突が大量に起きる
+        monkeypatch.setattr(text_filter, "_HASH_BASE", np.uint64(0))
+        recounted = []
+        original = text_filter._max_ngram_freq
+
+        def spy(text, phrase_len):
+            recounted.append(phrase_len)
+            return original(text, phrase_len)
+
+        monkeypatch.setattr(text_filter, "_max_ngram_freq", spy)
+
+        # 異なる漢字と「の」が交互に並ぶ（「の」で終わるN-gramのハッシュがすべて一致する）
+        text = "".join(chr(0x4E00 + i) + "の" for i in range(45))
+        assert len(text) >= _ROLLING_HASH_MIN_LEN
+
+        assert _has_repeated_phrases(text) is False
+        # 衝突による候補が実際に数え直されている
+        assert recounted
@@ -3,6 +3,7 @@
 """
 
 import pytest
+from app.services import translator as translator_module
 from app.services.translator import Translator, translate_text, get_translator
 
 
@@ -18,6 +19,7 @@ class TestTranslator:
     # _load_model のテスト
     # ========================================
 
+    @pytest.mark.slow
     def test_load_model_lazy_loading(self, translator):
         """遅延ロードの動作確認"""
         # 初期状態ではモデルは未ロード
@@ -31,6 +33,7 @@ class TestTranslator:
         assert translator.model is not None
         assert translator.tokenizer is not None
 
+    @pytest.mark.slow
     def test_load_model_idempotent(self, translator):
         """複数回呼び出しても同じインスタンス"""
         translator._load_model()
@@ -123,6 +126,15 @@ class TestTranslator:
 
         assert restored == text
 
+    def test_postprocess_text_many_replacements(self, translator):
+        """置換が4件以上の場合は1本の正規表現でまとめて復元"""
+        replacements = {f"__PHONE_{i}__": f"090{i:08d}" for i in range(12)}
+        text = " ".join(reversed(list(replacements)))
+        restored = translator._postprocess_text(text, replacements)
+
+        # __PHONE_1__ と __PHONE_10__ のように前方が共通するものも取り違えない
+        assert restored == " ".join(reversed(list(replacements.values())))
+
     # ========================================
     # _split_into_sentences のテスト
     # ========================================
@@ -190,6 +202,7 @@ class TestTranslator:
         result = translator.translate_text("   ")
         assert result == ""
 
+    @pytest.mark.slow
     def test_translate_text_basic_sentence(self, translator):
         """基本的な日本語文の翻訳（厳密な一致は求めない）"""
         text = "今日は良い天気です。"
@@ -200,6 +213,7 @@ class TestTranslator:
         assert len(result) > 0
         assert isinstance(result, str)
 
+    @pytest.mark.slow
     def test_translate_text_short_phrase(self, translator):
         """短いフレーズの翻訳"""
         text = "こんにちは"
@@ -213,6 +227,7 @@ class TestTranslator:
     # translate_text のテスト（長文処理）
     # ========================================
 
+    @pytest.mark.slow
     def test_translate_text_multiple_sentences(self, translator):
         """複数文の翻訳（文分割処理）"""
         text = "今日は良い天気です。明日も晴れるでしょう。"
@@ -222,6 +237,7 @@ class TestTranslator:
         assert result is not None
         assert len(result) > 0
 
+    @pytest.mark.slow
     def test_translate_text_long_text(self, translator):
         """長文の翻訳（自動分割）"""
         # 長い文を生成
@@ -236,6 +252,7 @@ class TestTranslator:
     # translate_text のテスト（前処理・後処理）
     # ========================================
 
+    @pytest.mark.slow
     def test_translate_text_with_phone_number(self, translator):
         """電話番号を含むテキストの翻訳"""
         text = "私の電話番号は09012345678です。"
@@ -250,6 +267,7 @@ class TestTranslator:
     # _translate_chunk のテスト（内部メソッド）
     # ========================================
 
+    @pytest.mark.slow
     def test_translate_chunk_basic(self, translator):
         """単一チャンクの翻訳処理"""
         translator._load_model()  # モデルを事前ロード
@@ -264,6 +282,7 @@ class TestTranslator:
     # _translate_long_text のテスト（内部メソッド）
     # ========================================
 
+    @pytest.mark.slow
     def test_translate_long_text_basic(self, translator):
         """長文翻訳処理（複数文の結合）"""
         translator._load_model()  # モデルを事前ロード
@@ -273,6 +292,74 @@ class TestTranslator:
         assert result is not None
         assert len(result) > 0
 
+    # ========================================
+    # _translate_batch のテスト（モデルを使わない）
+    # ========================================
+
+    @pytest.fixture
+    def generate_calls(self, translator, monkeypatch):
+        """_generate を差し替え、渡された文のリストを呼び出しごとに記録する"""
+        calls = []
+
+        def fake_generate(texts):
+            calls.append(list(texts))
+            return [f"EN({text})" for text in texts]
+
+        monkeypatch.setattr(translator, "_generate", fake_generate)
+        return calls
+
+    def test_translate_batch_dedupes_misses(self, translator, generate_calls):
+        """同じ文はまとめて1回だけ生成し、入力順で結果を返す"""
+        result = translator._translate_batch(["文A。", "文B。", "文A。"])
+
+        assert result == ["EN(文A。)", "EN(文B。)", "EN(文A。)"]
+        assert generate_calls == [["文A。", "文B。"]]
+
+    def test_translate_batch_uses_cache(self, translator, generate_calls):
+        """翻訳済みの文はキャッシュから返し、未翻訳の文のみ生成する"""
+        translator._translate_batch(["文A。", "文B。"])
+        result = translator._translate_batch(["文B。", "文C。"])
+
+        assert result == ["EN(文B。)", "EN(文C。)"]
+        assert generate_calls == [["文A。", "文B。"], ["文C。"]]
+
+    def test_translate_batch_lru_eviction(self, translator, generate_calls, monkeypatch):
+        """キャッシュ上限を超えると最も長く使われていない文から破棄する"""
+        monkeypatch.setattr(translator_module, "_TRANSLATION_CACHE_SIZE", 2)
+        translator._translate_batch(["文A。"])
+        translator._translate_batch(["文B。"])
+        translator._translate_batch(["文A。"])  # 文Aを最近使用に更新
+        translator._translate_batch(["文C。"])  # 文Bが破棄される
+
+        assert list(translator._translation_cache) == ["文A。", "文C。"]
+        translator._translate_batch(["文A。", "文B。"])
+        assert generate_calls[-1] == ["文B。"]
+
+    def test_translate_long_text_keeps_order_across_batches(
+        self, translator, generate_calls
+    ):
+        """長さごとのバッチに分けて翻訳しても元の文順で結合する"""
+        sentences = ["短い。", "これはかなり長めの文になっています。", "中くらいの文です。", "短文。"]
+        result = translator._translate_long_text("".join(sentences))
+
+        assert result == " ".join(f"EN({s})" for s in sentences)
+        # 長さの近い文どうしでまとめられる
+        assert sorted(map(sorted, generate_calls)) == sorted(
+            [sorted(["短い。", "短文。"]), ["中くらいの文です。"], ["これはかなり長めの文になっています。"]]
+        )
+
+    def test_group_by_length(self):
+        """長さの近い文のインデックスをまとめ、各グループの上限を守る"""
+        sentences = ["あ" * n for n in [10, 30, 11, 12, 31, 10, 10, 10, 10, 10, 10, 10]]
+        groups = translator_module._group_by_length(sentences)
+
+        # すべての文がちょうど1回ずつ含まれる
+        assert sorted(i for group in groups for i in group) == list(range(len(sentences)))
+        for group in groups:
+            assert len(group) <= translator_module._MAX_BATCH_SIZE
+            lengths = [len(sentences[i]) for i in group]
+            assert max(lengths) <= min(lengths) * translator_module._BATCH_LENGTH_RATIO
+
     # ========================================
     # パラメータ化テスト
     # ========================================
@@ -344,6 +431,7 @@ class TestGetTranslator:
 class TestTranslateTextFunction:
     """translate_text便利関数のテスト"""
 
+    @pytest.mark.slow
     def test_translate_text_function_basic(self):
         """基本的な翻訳動作"""
         result = translate_text("こんにちは")
@@ -355,6 +443,7 @@ class TestTranslateTextFunction:
         result = translate_text("")
         assert result == ""
 
+    @pytest.mark.slow
     def test_translate_text_function_uses_singleton(self):
         """シングルトンインスタンスを使用"""
         import app.services.translator as t
@@ -378,6 +467,7 @@ class TestTranslateTextFunction:
 # ========================================
 
 
+@pytest.mark.slow
 class TestTranslatorIntegration:
     """Translatorの統合テスト"""
 
@@ -0,0 +1,181 @@
+"""
+WebSocket接続マネージャーの送信キューのテスト
+
+実際のWebSocketの代わりに送信内容を記録する FakeWebSocket を使う
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from services import websocket_manager
+from services.websocket_manager import WebSocketManager
+
+
+class FakeWebSocket:
+    """送信内容を記録するWebSocket（gate が開くまで send_text を待たせられる）"""
+
+    def __init__(self):
+        self.client_state = SimpleNamespace(name="CONNECTED")
+        self.sent = []
+        self.closed = False
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self):
+        self.closed = True
+
+
+async def _connect(manager: WebSocketManager, websocket: FakeWebSocket):
+    """接続し、接続確認メッセージの送信完了まで待つ"""
+    connection = await manager.connect(websocket)
+    await connection.out_queue.join()
+    return connection
+
+
+@pytest.fixture
+def small_queue(monkeypatch):
+    """送信キューの上限を小さくする（接続前に適用）"""
+    monkeypatch.setattr(websocket_manager, "_OUT_QUEUE_SIZE", 2)
+
+
+class TestWebSocketManagerQueue:
+    """送信キューと writer タスクのテスト"""
+
+    def test_messages_are_sent_in_order(self):
+        """キューに積んだメッセージが writer タスクから順番に送信される"""
+
+        async def run():
+            manager = WebSocketManager()
+            websocket = FakeWebSocket()
+            connection = await _connect(manager, websocket)
+
+            for i in range(3):
+                assert await manager.send_json(connection.session_id, {"type": "result", "i": i})
+            await connection.out_queue.join()
+            return websocket.sent
+
+        sent = asyncio.run(run())
+        assert [m["type"] for m in sent] == ["connected", "result", "result", "result"]
+        assert [m["i"] for m in sent[1:]] == [0, 1, 2]
+
+    def test_progress_dropped_when_queue_full(self, small_queue):
+        """キューが満杯のとき進捗通知は待たずに破棄される"""
+
+        async def run():
+            manager = WebSocketManager()
+            websocket = FakeWebSocket()
+            connection = await _connect(manager, websocket)
+            session_id = connection.session_id
+
+            # 送信を止めて、writer が1件抱えた状態でキューを満杯にする
+            websocket.gate.clear()
+            for i in range(3):
+                await manager.send_json(session_id, {"type": "result", "i": i})
+            await asyncio.sleep(0)
+            assert connection.out_queue.full()
+
+            dropped = await manager.send_progress(session_id, "translating", "翻訳中")
+            queued = connection.out_queue.qsize()
+
+            websocket.gate.set()
+            await connection.out_queue.join()
+            return dropped, queued, websocket.sent
+
+        dropped, queued, sent = asyncio.run(run())
+        assert dropped is False
+        assert queued == 2
+        assert all(m["type"] != "progress" for m in sent)
+
+    def test_blocking_put_gives_up_when_writer_stops(self, small_queue):
+        """満杯のキューへの送信待ちは writer が停止したら諦めてFalseを返す"""
+
+        async def run():
+            manager = WebSocketManager()
+            websocket = FakeWebSocket()
+            connection = await _connect(manager, websocket)
+            session_id = connection.session_id
+
+            websocket.gate.clear()
+            for i in range(3):
+                await manager.send_json(session_id, {"type": "result", "i": i})
+            await asyncio.sleep(0)
+
+            pending = asyncio.create_task(
+                manager.send_json(session_id, {"type": "result", "i": 99})
+            )
+            await asyncio.sleep(0)
+            assert not pending.done()
+
+            connection.writer_task.cancel()
+            result = await asyncio.wait_for(pending, timeout=1)
+            # writer 停止後の送信も待たずに失敗する
+            after = await asyncio.wait_for(
+                manager.send_json(session_id, {"type": "result", "i": 100}), timeout=1
+            )
+            return result, after
+
+        result, after = asyncio.run(run())
+        assert result is False
+        assert after is False
+
+    def test_disconnect_drains_queue(self):
+        """切断時は送信キューの残りを送り切ってから閉じる"""
+
+        async def run():
+            manager = WebSocketManager()
+            websocket = FakeWebSocket()
+            connection = await _connect(manager, websocket)
+            session_id = connection.session_id
+
+            websocket.gate.clear()
+            for i in range(3):
+                await manager.send_json(session_id, {"type": "result", "i": i})
+
+            disconnecting = asyncio.create_task(manager.disconnect(session_id))
+            await asyncio.sleep(0)
+            # 送信待ちの間に接続は管理下から外れている
+            assert manager.get_connection(session_id) is None
+            assert not websocket.closed
+
+            websocket.gate.set()
+            await asyncio.wait_for(disconnecting, timeout=1)
+            return connection, websocket
+
+        connection, websocket = asyncio.run(run())
+        assert [m.get("i") for m in websocket.sent[1:]] == [0, 1, 2]
+        assert websocket.closed
+        assert connection.writer_task is None
+
+    def test_disconnect_gives_up_after_drain_timeout(self, monkeypatch):
+        """送信が進まない場合もタイムアウト後に切断を完了する"""
+        monkeypatch.setattr(websocket_manager, "_DRAIN_TIMEOUT_SECONDS", 0.01)
+
+        async def run():
+            manager = WebSocketManager()
+            websocket = FakeWebSocket()
+            connection = await _connect(manager, websocket)
+            session_id = connection.session_id
+
+            websocket.gate.clear()
+            await manager.send_json(session_id, {"type": "result", "i": 0})
+
+            # 二重に切断してもエラーにならない
+            await asyncio.wait_for(
+                asyncio.gather(manager.disconnect(session_id), manager.disconnect(session_id)),
+                timeout=1,
+            )
+            return manager, websocket
+
+        manager, websocket = asyncio.run(run())
+        assert websocket.closed
+        assert manager.get_active_connections_count() == 0
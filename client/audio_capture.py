@@ -109,7 +109,9 @@ def calculate_volume_db(audio_data: np.ndarray) -> float:
         return -60.0
 
     # RMS（二乗平均平方根）を計算
-    rms = np.sqrt(np.mean(audio_data.astype(np.float32) ** 2))
+    # 二乗配列の一時確保を避けるため、内積で二乗和を求める
+    samples = audio_data.astype(np.float32, copy=False).ravel()
+    rms = np.sqrt(np.dot(samples, samples) / samples.size)
 
     # dBに変換（16-bit PCMの最大値は32767）
     if rms > 0: